@@ -15,6 +15,9 @@ Features:
 Requirements:
 - IronPython 2.7
 - Agilent MP Expert software
+
+Pass --debug on the command line to also log diagnostic messages, such as
+the errors from sample detection methods that were tried and failed.
 """
 
 import clr
@@ -22,27 +25,255 @@ clr.AddReference("System.Windows.Forms")
 clr.AddReference("System.Drawing")
 clr.AddReference("System")
 
-import System
-from System import *
-from System.Drawing import *
-from System.Windows.Forms import *
-from System.Threading import *
-from System.Windows.Forms import Timer
+from System import Action, Array, ObjectDisposedException
+from System.Drawing import Color, Point, Size
+from System.Windows.Forms import (
+    Application, AutoValidate, Button, ColumnHeaderStyle, Control, ControlStyles, DialogResult,
+    ErrorProvider, FolderBrowserDialog, Form, FormBorderStyle, FormStartPosition, FormWindowState,
+    GroupBox, Label, ListBox, ListView, ListViewItem, MessageBox, MessageBoxButtons, MessageBoxIcon,
+    OpenFileDialog, SaveFileDialog, ScrollBars, TextBox, Timer, View,
+)
+from System.Threading import ManualResetEvent, ThreadPool, Timeout, TimerCallback, WaitCallback
+from System.Threading import Timer as ThreadingTimer
+from System.Text import StringBuilder
+from System.IO import FileAccess, FileMode, FileOptions, FileShare, FileStream
+from System.Net.Sockets import SocketException
+import sys
+import threading
 import time
+import zlib
+from collections import deque
+from Queue import Queue, Full
 import Automation
 from Automation import Automation
 
+LOG_MAX_LINES = 500     # Lines kept in the log ring buffer
+LOG_MAX_CHARS = 64000   # Log panel text is rebuilt from the ring buffer past this size
+LOG_TRIM_CHARS = LOG_MAX_CHARS // 2  # Most text kept by a rebuild, so the next one is far off
+LOG_FLUSH_INTERVAL_MS = 100  # Buffered log messages are written to the panel this often
+AUTO_CONNECT_TIMEOUT_MS = 2000  # Startup connection attempt is abandoned after this
+DISCONNECT_TIMEOUT_MS = 3000    # Client is disposed if Disconnect hangs longer than this
+STATUS_POLL_MIN_MS = 100              # Status poll interval right after responses arrive
+STATUS_INTERVAL_MS = 2000             # Longest status poll interval while the window is active
+STATUS_BACKGROUND_INTERVAL_MS = 5000  # Longest status poll interval while the window is inactive
+CMD_QUEUE_SIZE = 256  # Pending SDK commands before new ones are dropped
+EXPORT_BUFFER_SIZE = 65536  # FileStream buffer for streamed exports
+SAMPLES_TTL_S = 3.0  # Detected worksheet samples are reused for this long
+LOG_LEVEL_DEBUG = 10  # Log level that also shows diagnostic messages (--debug)
+LOG_LEVEL_INFO = 20   # Default log level - diagnostic messages are dropped unformatted
+
+# Log message templates - error templates and results are filled in as {0} by _logf
+LOG_PLASMA_ON = "Plasma ignition command sent"
+LOG_PLASMA_OFF = "Plasma extinguish command sent"
+LOG_PUMP_OFF = "Pump turned off"
+LOG_PUMP_SLOW = "Pump set to slow speed"
+LOG_PUMP_FAST = "Pump set to fast speed"
+LOG_PURGE_ON = "N2 purge enabled"
+LOG_PURGE_OFF = "N2 purge disabled"
+LOG_START = "Measurement started"
+LOG_STOP = "Measurement stopped"
+LOG_SELECT_SOLUTION = "Solution selected for measurement"
+LOG_VERSION = "Software version: {0}"
+LOG_STATUS = "Instrument status: {0}"
+LOG_READY = "Instrument set to ready state"
+LOG_STANDBY = "Instrument set to standby state"
+LOG_ERR_PLASMA_ON = "Plasma ignition error: {0}"
+LOG_ERR_PLASMA_OFF = "Plasma extinguish error: {0}"
+LOG_ERR_PUMP = "Pump control error: {0}"
+LOG_ERR_PURGE = "Purge control error: {0}"
+LOG_ERR_START = "Start measurement error: {0}"
+LOG_ERR_STOP = "Stop measurement error: {0}"
+LOG_ERR_EXPORT = "Export error: {0}"
+LOG_ERR_SELECT_SOLUTION = "Error selecting solution: {0}"
+LOG_ERR_VERSION = "Error getting version: {0}"
+LOG_ERR_STATUS = "Error getting status: {0}"
+LOG_ERR_READY = "Error setting ready state: {0}"
+LOG_ERR_STANDBY = "Error setting standby state: {0}"
+
+# Template/worksheet loader methods, in order of preference
+LOAD_METHODS = ('LoadTemplate', 'LoadWorksheet', 'LoadFile', 'OpenFile', 'Load')
+
+# Client members the handlers look up - probed once per connection into self._caps
+METHOD_NAMES = (
+    'GetSamples', 'GetSampleList', 'GetWorksheetInfo', 'GetSampleNames', 'GetSampleCount',
+    'SelectSolution', 'SelectSolutions', 'GetVersion', 'GetStatus', 'Ready', 'Standby',
+    'ShowUI', 'ShowUserInterface', 'Show', 'HideUI', 'HideUserInterface', 'Hide',
+    'WorksheetNew', 'WorksheetOpen', 'WorksheetSaveAs', 'WorksheetSaveClose', 'WorksheetClose',
+    'DeleteResults', 'Export', 'ExportToStream', 'ResponseReceived',
+) + LOAD_METHODS
+
+# SDK methods the UI calls - resolved once at startup to warm IronPython call sites
+WARMUP_METHODS = (
+    "Connect", "Disconnect", "PlasmaOn", "PlasmaOff", "PumpOff", "PumpSlow", "PumpFast",
+    "PurgeOn", "PurgeOff", "Start", "Stop", "ShowUI", "HideUI", "SelectSolution", "Export",
+    "WorksheetNew", "WorksheetOpen", "WorksheetSaveAs", "WorksheetSaveClose", "DeleteResults",
+    "GetSamples", "GetStatus", "GetVersion",
+)
+
+# Point/Size values shared between controls with the same coordinates
+_PT_CACHE = {}
+_SZ_CACHE = {}
+
+def _pt(x, y):
+    """Return a cached Point for (x, y)"""
+    point = _PT_CACHE.get((x, y))
+    if point is None:
+        point = _PT_CACHE[(x, y)] = Point(x, y)
+    return point
+
+def _sz(w, h):
+    """Return a cached Size for (w, h)"""
+    size = _SZ_CACHE.get((w, h))
+    if size is None:
+        size = _SZ_CACHE[(w, h)] = Size(w, h)
+    return size
+
+def _pick_connection_check(client):
+    """Probe the client once and return a callable reporting its connection state"""
+    if hasattr(client.Client, 'State') and hasattr(client.Client.State, 'Connected'):
+        # For XdrSocketClient, check the State property
+        return lambda c: c.Client.State.value__ == 1  # Connected state
+    # Fallback: assume connected if no exception was thrown
+    return lambda c: True
+
+# Default sample name for a 1-based position in the queue
+_sample_name = "Sample_{0:03d}".format
+
+# The adapters enumerate SDK collections exactly once - a truth test or len() on a
+# COM-backed collection can walk it again, so only None is checked up front
+
+def _adapt_iter(result):
+    """Sample names from an iterable SDK result"""
+    return map(str, result) if result is not None else []
+
+def _adapt_iter_or_single(result):
+    """Sample names from an iterable SDK result, or a single name"""
+    if result is None:
+        return []
+    if hasattr(result, '__iter__'):
+        return map(str, result)
+    return [str(result)] if result else []
+
+def _adapt_worksheet_info(info):
+    """Sample names from a worksheet info object's Samples collection"""
+    if info is not None and hasattr(info, 'Samples'):
+        return map(str, info.Samples)
+    return []
+
+def _adapt_count(count):
+    """Generic sample names for a sample count"""
+    n = int(count) if count else 0
+    return map(_sample_name, range(1, n + 1))
+
+# Sample detection methods in order of preference: (client method, result -> list of names)
+SAMPLE_STRATEGIES = (
+    ('GetSamples', _adapt_iter),
+    ('GetSampleList', _adapt_iter_or_single),
+    ('GetWorksheetInfo', _adapt_worksheet_info),
+    ('GetSampleNames', _adapt_iter),
+    ('GetSampleCount', _adapt_count),
+)
+
+def _call_with_timeout(fn, timeout_ms):
+    """Run fn on a daemon thread and wait at most timeout_ms - returns (finished, error)"""
+    result = {}
+    done = ManualResetEvent(False)
+    
+    def run():
+        try:
+            fn()
+        except Exception as ex:
+            result['error'] = ex
+        done.Set()
+    
+    thread = threading.Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    if not done.WaitOne(timeout_ms):
+        return False, None
+    return True, result.get('error')
+
+def _is_socket_error(ex):
+    """Return True if ex is a socket failure, checking the exception types before the message"""
+    clr_ex = getattr(ex, 'clsException', ex)  # .NET exception behind an IronPython one
+    if isinstance(clr_ex, SocketException) or isinstance(getattr(clr_ex, 'InnerException', None), SocketException):
+        return True
+    # Fallback for exceptions the SDK wrapped in its own types
+    message = str(ex)
+    return "SocketException" in message or "established connection was aborted" in message
+
+def _command_handler(sdk_name, done_msg, error_fmt):
+    """Build a button handler that queues client.<sdk_name>() on the command worker"""
+    def handler(self, sender, e):
+        if self.client and self.connected:
+            self._post_command(sdk_name, lambda: getattr(self.client, sdk_name)(), done_msg, error_fmt)
+    handler.__doc__ = "Handle {0} button click".format(sdk_name)
+    return handler
+
+def requires_cap(cap):
+    """Decorate handler(self, fn, sender, e) to run only when connected and client.<cap> was probed"""
+    def decorate(handler):
+        def wrapper(self, sender, e):
+            if not self.connected:
+                return
+            fn = self._caps.get(cap)
+            if fn is None:
+                self._logf("{0} method not available", cap)
+                return
+            return handler(self, fn, sender, e)
+        wrapper.__name__ = handler.__name__
+        wrapper.__doc__ = handler.__doc__
+        return wrapper
+    return decorate
+
 class InstrumentControlGUI(Form):
     """Main GUI application for instrument control"""
     
-    def __init__(self):
+    def __new__(cls, samples_ttl=SAMPLES_TTL_S, log_level=LOG_LEVEL_INFO):
+        """Create the form - keyword options are handled by __init__, not the .NET constructor"""
+        return Form.__new__(cls)
+    
+    def __init__(self, samples_ttl=SAMPLES_TTL_S, log_level=LOG_LEVEL_INFO):
         """Initialize the GUI application"""
-        self.client = None
+        # One SDK client is reused across connect/disconnect cycles and only
+        # disposed when the form closes
+        self.client = Automation()
+        self._client_disposed = False
+        self._conn_check = None  # Connection state check, probed on first connect
         self.connected = False
+        self._conn_generation = 0  # Bumped whenever a connection ends - see _post_command
         self.status_timer = None
         self.output_path = ""
         self.template_path = ""
         self.lims_output_path = ""  # Separate path for LIMS exports
+        self._poll_lock = threading.Lock()  # Held while a status poll is running
+        self._status_interval_ms = STATUS_INTERVAL_MS  # Backoff cap for the status poll
+        self._poll_interval_ms = STATUS_POLL_MIN_MS    # Delay before the next status poll
+        self._polling = False         # Status polling is running
+        self._event_driven = False    # Subscribed to the client's ResponseReceived event
+        self._last_status_rows = []    # Rows currently shown in the status list
+        self._last_status_hash = None  # CRC32 of the last rows sent to the UI
+        self._ts_cache = (-1, "")      # (epoch second, formatted log timestamp)
+        self._log_level = log_level    # Diagnostic messages are only logged at LOG_LEVEL_DEBUG
+        self._debug_methods_cache = None  # Log lines listing the client's methods
+        self._sample_counter = 0  # Samples queued, used for the next default sample name
+        self._samples_ttl = samples_ttl      # Seconds a detected sample list stays fresh
+        self._samples_cache = (0.0, -1, [])  # (detection time, worksheet id, names)
+        self._worksheet_id = 0               # Bumped whenever the open worksheet changes
+        self._caps = None         # METHOD_NAMES -> bound member or None, probed on connect
+        self._members = None      # Client's public member names, listed on demand
+        self._sample_method_catalog = None  # Sample/worksheet member names, for diagnostics
+        self._show_ui_fn = None   # Resolved ShowUI-style method, if any
+        self._hide_ui_fn = None   # Resolved HideUI-style method, if any
+        self._load_fn = None      # Resolved template/worksheet loader, if any
+        self._load_name = None    # SDK name of _load_fn, for logging
+        
+        # Instrument commands run in order on one worker thread, off the UI thread
+        self.cmd_queue = Queue(maxsize=CMD_QUEUE_SIZE)
+        self._cmd_thread = threading.Thread(target=self._cmd_worker)
+        self._cmd_thread.daemon = True
+        self._cmd_thread.start()
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -54,35 +285,79 @@ class InstrumentControlGUI(Form):
         self.FormBorderStyle = FormBorderStyle.FixedDialog
         self.MaximizeBox = False
         
-        # Create main layout
-        self.create_connection_panel()
-        self.create_status_panel()
-        self.create_control_panel()
-        self.create_worksheet_panel()  # New comprehensive worksheet panel
-        self.create_sample_panel()
-        self.create_advanced_panel()   # New advanced controls panel
-        self.create_log_panel()
+        # Paint the form through an off-screen buffer to avoid flicker
+        self.DoubleBuffered = True
+        self.SetStyle(ControlStyles.OptimizedDoubleBuffer | ControlStyles.AllPaintingInWmPaint, True)
+        
+        # Create main layout - panels are added in one batch with layout suspended
+        self.SuspendLayout()
+        self.Controls.AddRange(Array[Control]([
+            self.create_connection_panel(),
+            self.create_status_panel(),
+            self.create_control_panel(),
+            self.create_worksheet_panel(),  # New comprehensive worksheet panel
+            self.create_sample_panel(),
+            self.create_advanced_panel(),   # New advanced controls panel
+            self.create_log_panel(),
+        ]))
+        self.ResumeLayout(False)
+        self.PerformLayout()
+        
+        # Controls toggled by enable_controls
+        self._conn_gated_controls = [
+            # Basic controls
+            self.plasma_on_button, self.plasma_off_button,
+            self.pump_off_button, self.pump_slow_button, self.pump_fast_button,
+            self.purge_on_button, self.purge_off_button,
+            self.start_button, self.stop_button,
+            self.show_ui_button, self.hide_ui_button,
+            self.process_samples_button, self.export_button,
+            # Worksheet controls
+            self.worksheet_new_button, self.worksheet_open_button,
+            self.worksheet_save_button, self.worksheet_save_close_button,
+            self.delete_results_button, self.lims_export_button,
+            # Sample controls
+            self.select_for_measurement_button,
+            self.refresh_samples_button, self.refresh_all_button,
+        ]
+        self._always_on_controls = [
+            self.output_location_button, self.load_template_button, self.lims_location_button,
+        ]
         
         # Setup timer for status updates
-        self.status_timer = Timer()
-        self.status_timer.Interval = 1000  # Update every second
-        self.status_timer.Tick += self.update_status
-        self.status_timer.Enabled = False  # Start disabled
+        # Thread-pool timer so poll cadence doesn't depend on the UI message pump
+        self.status_timer = ThreadingTimer(TimerCallback(self.update_status), None,
+                                           Timeout.Infinite, Timeout.Infinite)  # Start disabled
+        
+        # Pause polling while minimized, slow it down while in the background
+        self.Resize += self.form_resize
+        self.Activated += self.form_activated
+        self.Deactivate += self.form_deactivate
         
         # Handle form closing
         self.FormClosing += self.form_closing
         
-        # Attempt automatic connection at startup
-        self.auto_connect_at_startup()
+        # Attempt automatic connection once the window is shown
+        self.Shown += self.form_shown
         
     def form_closing(self, sender, e):
         """Handle form closing event"""
         try:
             # Stop the status timer first
             if self.status_timer:
-                self.status_timer.Stop()
+                self.stop_status_polling()
                 self.status_timer.Dispose()
             
+            # Let the command worker exit
+            try:
+                self.cmd_queue.put_nowait(None)
+            except Full:
+                pass  # Daemon thread ends with the process
+            
+            # No further log flushes once the form is closing
+            self._log_flush_timer.Stop()
+            self._log_flush_timer.Dispose()
+            
             # Disconnect from instrument if connected
             if self.client and self.connected:
                 self.log_message("Disconnecting from instrument...")
@@ -92,131 +367,335 @@ class InstrumentControlGUI(Form):
                     self.client.Disconnect()
                 except Exception as disconnect_ex:
                     # Socket exceptions are expected when connection is already broken
-                    if "SocketException" in str(disconnect_ex):
+                    if _is_socket_error(disconnect_ex):
                         self.log_message("Connection already closed by remote host")
                     else:
-                        self.log_message("Disconnect warning: {0}".format(str(disconnect_ex)))
+                        self._logf("Disconnect warning: {0}", str(disconnect_ex))
                 
-                # Clean up resources
+                self.connected = False
+                self.log_message("Disconnected successfully")
+            
+            # Clean up resources - the client is only disposed here
+            if self.client and not self._client_disposed:
                 try:
                     self.client.Dispose()
                 except Exception as dispose_ex:
-                    self.log_message("Resource cleanup warning: {0}".format(str(dispose_ex)))
-                
-                self.connected = False
-                self.log_message("Disconnected successfully")
+                    print("Resource cleanup warning: {0}".format(str(dispose_ex)))
+                self._client_disposed = True
                 
         except Exception as ex:
             # Log but don't prevent closing
             print("Error during cleanup: {0}".format(str(ex)))
     
-    def auto_connect_at_startup(self):
-        """Attempt automatic connection at startup"""
+    def _probe_client_capabilities(self):
+        """Resolve the METHOD_NAMES members and method aliases (once per connection)"""
+        caps = {}
+        for name in METHOD_NAMES:
+            try:
+                caps[name] = getattr(self.client, name, None)
+            except Exception:
+                caps[name] = None  # Member not readable on this client
+        self._caps = caps
+        self._show_ui_fn = caps.get('ShowUI') or caps.get('ShowUserInterface') or caps.get('Show')
+        self._hide_ui_fn = caps.get('HideUI') or caps.get('HideUserInterface') or caps.get('Hide')
+        self._load_fn = self._load_name = None
+        for name in LOAD_METHODS:
+            if caps.get(name):
+                self._load_fn, self._load_name = caps[name], name
+                break
+    
+    def _member_names(self):
+        """Return the client's public member names, listed once per connection"""
+        if self._members is None:
+            self._members = [name for name in dir(self.client) if not name.startswith('_')]
+        return self._members
+    
+    def _sample_methods(self):
+        """Return up to ten client members about samples or worksheets, filtered once per connection"""
+        if self._sample_method_catalog is None:
+            found = []
+            for name in self._member_names():
+                lowered = name.lower()
+                if 'sample' in lowered or 'worksheet' in lowered:
+                    found.append(name)
+                    if len(found) == 10:
+                        break
+            self._sample_method_catalog = tuple(found)
+        return self._sample_method_catalog
+    
+    def _clear_caps(self):
+        """Drop the capabilities probed by _probe_client_capabilities"""
+        self._caps = None
+        self._members = None
+        self._sample_method_catalog = None
+        # The next connection may have a different worksheet open
+        self._worksheet_changed()
+        # Commands still queued for the old connection must not run on the next one
+        self._conn_generation += 1
+        self._show_ui_fn = None
+        self._hide_ui_fn = None
+        self._load_fn = None
+        self._load_name = None
+    
+    def _is_connected(self):
+        """Check the client's connection state after Connect()"""
+        if self._conn_check is None:
+            self._conn_check = _pick_connection_check(self.client)
+        return self._conn_check(self.client)
+    
+    def form_resize(self, sender, e):
+        """Handle form resize event - stop polling while minimized"""
+        if not self.connected:
+            return
+        if self.WindowState == FormWindowState.Minimized:
+            self.stop_status_polling()
+        else:
+            self.start_status_polling()
+    
+    def form_activated(self, sender, e):
+        """Handle form activated event - poll at the normal rate"""
+        self.set_status_interval(STATUS_INTERVAL_MS)
+    
+    def form_deactivate(self, sender, e):
+        """Handle form deactivate event - poll less often in the background"""
+        self.set_status_interval(STATUS_BACKGROUND_INTERVAL_MS)
+    
+    def start_status_polling(self):
+        """Start (or restart) status polling from the shortest interval"""
+        self._polling = True
+        self._poll_interval_ms = STATUS_POLL_MIN_MS
+        # Prefer being told about responses over polling for them
+        if not self._event_driven and self._caps and self._caps.get('ResponseReceived'):
+            try:
+                self.client.ResponseReceived += self._on_response_received
+                self._event_driven = True
+            except Exception as ex:
+                self._logf("ResponseReceived unavailable, polling instead: {0}", str(ex))
+        self.status_timer.Change(0, Timeout.Infinite)
+    
+    def stop_status_polling(self):
+        """Stop the status timer"""
+        self._polling = False
+        self.status_timer.Change(Timeout.Infinite, Timeout.Infinite)
+        if self._event_driven:
+            try:
+                self.client.ResponseReceived -= self._on_response_received
+            except Exception:
+                pass  # Client already torn down
+            self._event_driven = False
+    
+    def set_status_interval(self, interval_ms):
+        """Change the longest status poll interval, applying it now if polling is active"""
+        self._status_interval_ms = interval_ms
+        if self._polling and self._poll_interval_ms > interval_ms:
+            self._poll_interval_ms = interval_ms
+            self.status_timer.Change(interval_ms, Timeout.Infinite)
+    
+    def _schedule_next_poll(self, got_responses):
+        """Back off while the instrument is quiet, return to fast polling once it talks"""
+        if self._event_driven:
+            # Events deliver responses - keep a slow poll only as a safety net
+            interval = self._status_interval_ms
+        elif got_responses:
+            interval = STATUS_POLL_MIN_MS
+        else:
+            interval = min(self._status_interval_ms, self._poll_interval_ms * 2)
+        self._poll_interval_ms = interval
         try:
-            # Use default connection values
-            host = self.host_textbox.Text
-            port_text = self.port_textbox.Text
-            
-            self.log_message("Attempting automatic connection to {0}:{1}...".format(host, port_text))
-            
-            # Validate port number
+            self.status_timer.Change(interval, Timeout.Infinite)
+        except ObjectDisposedException:
+            # form_closing disposed the timer while this poll was running - an unhandled
+            # error here would kill the process from the thread pool
+            pass
+    
+    def form_shown(self, sender, e):
+        """Handle form shown event - start auto-connect once the window is visible"""
+        ThreadPool.QueueUserWorkItem(WaitCallback(self._warmup_bg))
+        self.auto_connect_at_startup()
+    
+    def _warmup_bg(self, state):
+        """Resolve the SDK methods used by the UI so first clicks skip call-site setup"""
+        client = self.client
+        if not client:
+            return
+        for name in WARMUP_METHODS:
+            getattr(client, name, None)
+    
+    def auto_connect_at_startup(self):
+        """Attempt automatic connection at startup without blocking the UI"""
+        # Use default connection values (validated when the textboxes were created)
+        host = self._host_cached
+        port = self._port_cached
+        
+        self._logf("Attempting automatic connection to {0}:{1}...", self.host_textbox.Text, self.port_textbox.Text)
+        
+        if host is None or port is None:
+            self.log_message("Invalid default host or port, skipping auto-connect")
+            return
+        
+        # Prevent a manual connect racing the background attempt
+        self.connect_button.Enabled = False
+        ThreadPool.QueueUserWorkItem(WaitCallback(lambda state: self._auto_connect_bg(host, port)))
+    
+    def _auto_connect_bg(self, host, port):
+        """Connect on a worker thread, giving up after AUTO_CONNECT_TIMEOUT_MS"""
+        client = self.client
+        finished, connect_error = _call_with_timeout(lambda: client.Connect(host, port),
+                                                     AUTO_CONNECT_TIMEOUT_MS)
+        
+        error = None
+        replacement = None
+        if not finished:
+            error = "startup connect timed out"
+            # Abort the pending socket; a disposed client cannot be reused
             try:
-                port = int(port_text)
-                if port < 1 or port > 65535:
-                    self.log_message("Invalid default port number, skipping auto-connect")
-                    return
-            except ValueError:
-                self.log_message("Invalid default port format, skipping auto-connect")
-                return
-            
-            # Attempt connection
-            self.client = Automation()
-            self.client.Connect(host, port)
-            
-            # Check connection state
-            if hasattr(self.client.Client, 'State') and hasattr(self.client.Client.State, 'Connected'):
-                connected = (self.client.Client.State.value__ == 1)  # Connected state
-            else:
-                connected = True  # Assume connected if no exception
-            
-            if connected:
-                self.connected = True
-                self.connection_status.Text = "Connected (Auto)"
-                self.connection_status.ForeColor = Color.Green
-                self.connect_button.Enabled = False
-                self.disconnect_button.Enabled = True
-                self.enable_controls(True)
-                self.status_timer.Start()
-                self.log_message("Auto-connection successful")
-            else:
-                self.log_message("Auto-connection failed - instrument not responding")
-                
-        except Exception as ex:
+                client.Dispose()
+            except Exception:
+                pass
+            replacement = Automation()
+        elif connect_error is not None:
+            error = str(connect_error)
+        
+        self._post_to_ui(lambda: self._finish_auto_connect(error, replacement))
+    
+    def _adopt_client(self, client):
+        """Switch to a fresh client after the previous one had to be disposed"""
+        self.client = client
+        self._conn_check = None
+        self._debug_methods_cache = None
+        self._clear_caps()
+    
+    def _finish_auto_connect(self, error, replacement=None):
+        """Apply the auto-connect result (runs on the UI thread)"""
+        if replacement is not None:
+            self._adopt_client(replacement)
+        
+        if error is not None:
             # Auto-connect failed, but don't show error dialogs at startup
-            self.log_message("Auto-connection failed: {0}".format(str(ex)))
+            self._logf("Auto-connection failed: {0}", error)
             self.log_message("You can manually connect using the Connect button")
+            self.connect_button.Enabled = True
+            return
         
+        if self._is_connected():
+            self.connected = True
+            self._probe_client_capabilities()
+            self.connection_status.Text = "Connected (Auto)"
+            self.connection_status.ForeColor = Color.Green
+            self.connect_button.Enabled = False
+            self.disconnect_button.Enabled = True
+            self.enable_controls(True)
+            self.start_status_polling()
+            self.log_message("Auto-connection successful")
+        else:
+            self.log_message("Auto-connection failed - instrument not responding")
+            self.connect_button.Enabled = True
+    
+    def _mkbutton(self, text, x, y, w, h, color=None, handler=None, enabled=True):
+        """Create a button with the given text, bounds, back color and click handler"""
+        button = Button()
+        button.Text = text
+        button.Location = _pt(x, y)
+        button.Size = _sz(w, h)
+        if color is not None:
+            button.BackColor = color
+        if handler is not None:
+            button.Click += handler
+        button.Enabled = enabled
+        return button
+    
+    def _mklabel(self, text, x, y, w, h, color=None):
+        """Create a label with the given text, bounds and fore color"""
+        label = Label()
+        label.Text = text
+        label.Location = _pt(x, y)
+        label.Size = _sz(w, h)
+        if color is not None:
+            label.ForeColor = color
+        return label
+    
+    def _mktextbox(self, text, x, y, w, h):
+        """Create a single-line text box with the given text and bounds"""
+        textbox = TextBox()
+        textbox.Text = text
+        textbox.Location = _pt(x, y)
+        textbox.Size = _sz(w, h)
+        return textbox
+    
     def create_connection_panel(self):
         """Create connection control panel"""
         connection_group = GroupBox()
+        connection_group.SuspendLayout()
+        controls = []
         connection_group.Text = "Connection"
         connection_group.Location = Point(10, 10)
         connection_group.Size = Size(300, 80)
         
         # Host/Port inputs
-        host_label = Label()
-        host_label.Text = "Host:"
-        host_label.Location = Point(10, 25)
-        host_label.Size = Size(40, 20)
-        connection_group.Controls.Add(host_label)
-        
-        self.host_textbox = TextBox()
-        self.host_textbox.Text = "127.0.0.1"
-        self.host_textbox.Location = Point(50, 23)
-        self.host_textbox.Size = Size(80, 20)
-        connection_group.Controls.Add(self.host_textbox)
-        
-        port_label = Label()
-        port_label.Text = "Port:"
-        port_label.Location = Point(140, 25)
-        port_label.Size = Size(30, 20)
-        connection_group.Controls.Add(port_label)
-        
-        self.port_textbox = TextBox()
-        self.port_textbox.Text = "8000"
-        self.port_textbox.Location = Point(175, 23)
-        self.port_textbox.Size = Size(50, 20)
-        connection_group.Controls.Add(self.port_textbox)
+        controls.append(self._mklabel("Host:", 10, 25, 40, 20))
+        
+        self.host_textbox = self._mktextbox("127.0.0.1", 50, 23, 80, 20)
+        controls.append(self.host_textbox)
+        
+        controls.append(self._mklabel("Port:", 140, 25, 30, 20))
+        
+        self.port_textbox = self._mktextbox("8000", 175, 23, 50, 20)
+        controls.append(self.port_textbox)
+        
+        # Host/port are validated as they are edited and cached for connecting
+        self.input_errors = ErrorProvider()
+        self.AutoValidate = AutoValidate.EnableAllowFocusChange
+        self.host_textbox.Validating += self.validate_host
+        self.port_textbox.Validating += self.validate_port
+        self.validate_host(self.host_textbox, None)
+        self.validate_port(self.port_textbox, None)
         
         # Connect/Disconnect buttons
-        self.connect_button = Button()
-        self.connect_button.Text = "Connect"
-        self.connect_button.Location = Point(10, 50)
-        self.connect_button.Size = Size(70, 25)
-        self.connect_button.Click += self.connect_clicked
-        connection_group.Controls.Add(self.connect_button)
-        
-        self.disconnect_button = Button()
-        self.disconnect_button.Text = "Disconnect"
-        self.disconnect_button.Location = Point(90, 50)
-        self.disconnect_button.Size = Size(80, 25)
-        self.disconnect_button.Enabled = False
-        self.disconnect_button.Click += self.disconnect_clicked
-        connection_group.Controls.Add(self.disconnect_button)
+        self.connect_button = self._mkbutton("Connect", 10, 50, 70, 25, handler=self.connect_clicked)
+        controls.append(self.connect_button)
+        
+        self.disconnect_button = self._mkbutton("Disconnect", 90, 50, 80, 25, handler=self.disconnect_clicked, enabled=False)
+        controls.append(self.disconnect_button)
         
         # Connection status
-        self.connection_status = Label()
-        self.connection_status.Text = "Not Connected"
-        self.connection_status.Location = Point(180, 55)
-        self.connection_status.Size = Size(100, 20)
-        self.connection_status.ForeColor = Color.Red
-        connection_group.Controls.Add(self.connection_status)
+        self.connection_status = self._mklabel("Not Connected", 180, 55, 100, 20, Color.Red)
+        controls.append(self.connection_status)
         
-        self.Controls.Add(connection_group)
+        connection_group.Controls.AddRange(Array[Control](controls))
+        connection_group.ResumeLayout(False)
+        return connection_group
+    
+    def validate_host(self, sender, e):
+        """Validate and cache the host textbox value"""
+        host = self.host_textbox.Text.strip()
+        if host:
+            self._host_cached = host
+            self.input_errors.SetError(self.host_textbox, "")
+        else:
+            self._host_cached = None
+            self.input_errors.SetError(self.host_textbox, "Host is required")
+            if e is not None:
+                e.Cancel = True
+    
+    def validate_port(self, sender, e):
+        """Validate and cache the port textbox value"""
+        try:
+            port = int(self.port_textbox.Text)
+            if port < 1 or port > 65535:
+                raise ValueError()
+            self._port_cached = port
+            self.input_errors.SetError(self.port_textbox, "")
+        except ValueError:
+            self._port_cached = None
+            self.input_errors.SetError(self.port_textbox, "Port must be between 1 and 65535")
+            if e is not None:
+                e.Cancel = True
     
     def create_status_panel(self):
         """Create instrument status display panel"""
         status_group = GroupBox()
+        status_group.SuspendLayout()
+        controls = []
         status_group.Text = "Instrument Status"
         status_group.Location = Point(320, 10)
         status_group.Size = Size(320, 180)  # Reduced width and height for better fit
@@ -224,329 +703,203 @@ class InstrumentControlGUI(Form):
         self.status_listbox = ListBox()
         self.status_listbox.Location = Point(10, 20)
         self.status_listbox.Size = Size(300, 150)  # Adjusted for new panel size
-        status_group.Controls.Add(self.status_listbox)
+        controls.append(self.status_listbox)
         
-        self.Controls.Add(status_group)
+        status_group.Controls.AddRange(Array[Control](controls))
+        status_group.ResumeLayout(False)
+        return status_group
     
     def create_control_panel(self):
         """Create instrument control panel"""
         control_group = GroupBox()
+        control_group.SuspendLayout()
+        controls = []
         control_group.Text = "Instrument Control"
         control_group.Location = Point(10, 100)
         control_group.Size = Size(300, 250)
         
         # Plasma controls
-        plasma_label = Label()
-        plasma_label.Text = "Plasma Control:"
-        plasma_label.Location = Point(10, 25)
-        plasma_label.Size = Size(100, 20)
-        control_group.Controls.Add(plasma_label)
-        
-        self.plasma_on_button = Button()
-        self.plasma_on_button.Text = "Ignite"
-        self.plasma_on_button.Location = Point(10, 45)
-        self.plasma_on_button.Size = Size(60, 30)
-        self.plasma_on_button.BackColor = Color.LightGreen
-        self.plasma_on_button.Click += self.plasma_on_clicked
-        control_group.Controls.Add(self.plasma_on_button)
-        
-        self.plasma_off_button = Button()
-        self.plasma_off_button.Text = "Extinguish"
-        self.plasma_off_button.Location = Point(80, 45)
-        self.plasma_off_button.Size = Size(80, 30)
-        self.plasma_off_button.BackColor = Color.LightCoral
-        self.plasma_off_button.Click += self.plasma_off_clicked
-        control_group.Controls.Add(self.plasma_off_button)
+        controls.append(self._mklabel("Plasma Control:", 10, 25, 100, 20))
+        
+        self.plasma_on_button = self._mkbutton("Ignite", 10, 45, 60, 30, Color.LightGreen, self.plasma_on_clicked)
+        controls.append(self.plasma_on_button)
+        
+        self.plasma_off_button = self._mkbutton("Extinguish", 80, 45, 80, 30, Color.LightCoral, self.plasma_off_clicked)
+        controls.append(self.plasma_off_button)
         
         # Pump controls
-        pump_label = Label()
-        pump_label.Text = "Pump Control:"
-        pump_label.Location = Point(10, 85)
-        pump_label.Size = Size(100, 20)
-        control_group.Controls.Add(pump_label)
-        
-        self.pump_off_button = Button()
-        self.pump_off_button.Text = "Off"
-        self.pump_off_button.Location = Point(10, 105)
-        self.pump_off_button.Size = Size(50, 25)
-        self.pump_off_button.Click += self.pump_off_clicked
-        control_group.Controls.Add(self.pump_off_button)
-        
-        self.pump_slow_button = Button()
-        self.pump_slow_button.Text = "Slow"
-        self.pump_slow_button.Location = Point(70, 105)
-        self.pump_slow_button.Size = Size(50, 25)
-        self.pump_slow_button.Click += self.pump_slow_clicked
-        control_group.Controls.Add(self.pump_slow_button)
-        
-        self.pump_fast_button = Button()
-        self.pump_fast_button.Text = "Fast"
-        self.pump_fast_button.Location = Point(130, 105)
-        self.pump_fast_button.Size = Size(50, 25)
-        self.pump_fast_button.Click += self.pump_fast_clicked
-        control_group.Controls.Add(self.pump_fast_button)
+        controls.append(self._mklabel("Pump Control:", 10, 85, 100, 20))
+        
+        self.pump_off_button = self._mkbutton("Off", 10, 105, 50, 25, handler=self.pump_off_clicked)
+        controls.append(self.pump_off_button)
+        
+        self.pump_slow_button = self._mkbutton("Slow", 70, 105, 50, 25, handler=self.pump_slow_clicked)
+        controls.append(self.pump_slow_button)
+        
+        self.pump_fast_button = self._mkbutton("Fast", 130, 105, 50, 25, handler=self.pump_fast_clicked)
+        controls.append(self.pump_fast_button)
         
         # Purge controls
-        purge_label = Label()
-        purge_label.Text = "N2 Purge:"
-        purge_label.Location = Point(10, 140)
-        purge_label.Size = Size(80, 20)
-        control_group.Controls.Add(purge_label)
-        
-        self.purge_on_button = Button()
-        self.purge_on_button.Text = "On"
-        self.purge_on_button.Location = Point(10, 160)
-        self.purge_on_button.Size = Size(50, 25)
-        self.purge_on_button.Click += self.purge_on_clicked
-        control_group.Controls.Add(self.purge_on_button)
-        
-        self.purge_off_button = Button()
-        self.purge_off_button.Text = "Off"
-        self.purge_off_button.Location = Point(70, 160)
-        self.purge_off_button.Size = Size(50, 25)
-        self.purge_off_button.Click += self.purge_off_clicked
-        control_group.Controls.Add(self.purge_off_button)
+        controls.append(self._mklabel("N2 Purge:", 10, 140, 80, 20))
+        
+        self.purge_on_button = self._mkbutton("On", 10, 160, 50, 25, handler=self.purge_on_clicked)
+        controls.append(self.purge_on_button)
+        
+        self.purge_off_button = self._mkbutton("Off", 70, 160, 50, 25, handler=self.purge_off_clicked)
+        controls.append(self.purge_off_button)
         
         # Measurement controls
-        measurement_label = Label()
-        measurement_label.Text = "Measurement:"
-        measurement_label.Location = Point(10, 195)
-        measurement_label.Size = Size(100, 20)
-        control_group.Controls.Add(measurement_label)
-        
-        self.start_button = Button()
-        self.start_button.Text = "Start"
-        self.start_button.Location = Point(10, 215)
-        self.start_button.Size = Size(60, 25)
-        self.start_button.BackColor = Color.LightBlue
-        self.start_button.Click += self.start_clicked
-        control_group.Controls.Add(self.start_button)
-        
-        self.stop_button = Button()
-        self.stop_button.Text = "Stop"
-        self.stop_button.Location = Point(80, 215)
-        self.stop_button.Size = Size(60, 25)
-        self.stop_button.BackColor = Color.Orange
-        self.stop_button.Click += self.stop_clicked
-        control_group.Controls.Add(self.stop_button)
+        controls.append(self._mklabel("Measurement:", 10, 195, 100, 20))
+        
+        self.start_button = self._mkbutton("Start", 10, 215, 60, 25, Color.LightBlue, self.start_clicked)
+        controls.append(self.start_button)
+        
+        self.stop_button = self._mkbutton("Stop", 80, 215, 60, 25, Color.Orange, self.stop_clicked)
+        controls.append(self.stop_button)
         
         # MP Expert UI controls
-        ui_label = Label()
-        ui_label.Text = "MP Expert UI:"
-        ui_label.Location = Point(170, 195)
-        ui_label.Size = Size(100, 20)
-        control_group.Controls.Add(ui_label)
-        
-        self.show_ui_button = Button()
-        self.show_ui_button.Text = "Show UI"
-        self.show_ui_button.Location = Point(170, 215)
-        self.show_ui_button.Size = Size(60, 25)
-        self.show_ui_button.BackColor = Color.LightGray
-        self.show_ui_button.Click += self.show_ui_clicked
-        control_group.Controls.Add(self.show_ui_button)
-        
-        self.hide_ui_button = Button()
-        self.hide_ui_button.Text = "Hide UI"
-        self.hide_ui_button.Location = Point(240, 215)
-        self.hide_ui_button.Size = Size(60, 25)
-        self.hide_ui_button.BackColor = Color.LightGray
-        self.hide_ui_button.Click += self.hide_ui_clicked
-        control_group.Controls.Add(self.hide_ui_button)
+        controls.append(self._mklabel("MP Expert UI:", 170, 195, 100, 20))
+        
+        self.show_ui_button = self._mkbutton("Show UI", 170, 215, 60, 25, Color.LightGray, self.show_ui_clicked)
+        controls.append(self.show_ui_button)
+        
+        self.hide_ui_button = self._mkbutton("Hide UI", 240, 215, 60, 25, Color.LightGray, self.hide_ui_clicked)
+        controls.append(self.hide_ui_button)
 
-        self.Controls.Add(control_group)
+        control_group.Controls.AddRange(Array[Control](controls))
+        control_group.ResumeLayout(False)
+        return control_group
     
     def create_worksheet_panel(self):
         """Create comprehensive worksheet management panel"""
         worksheet_group = GroupBox()
+        worksheet_group.SuspendLayout()
+        controls = []
         worksheet_group.Text = "Worksheet Management"
         worksheet_group.Location = Point(320, 200)  # Moved up slightly
         worksheet_group.Size = Size(320, 130)  # Reduced width to match status panel
         
         # Worksheet operations row 1
-        self.worksheet_new_button = Button()
-        self.worksheet_new_button.Text = "New from Template"
-        self.worksheet_new_button.Location = Point(10, 25)
-        self.worksheet_new_button.Size = Size(95, 25)  # Slightly smaller to fit
-        self.worksheet_new_button.BackColor = Color.LightGreen
-        self.worksheet_new_button.Click += self.worksheet_new_clicked
-        worksheet_group.Controls.Add(self.worksheet_new_button)
-        
-        self.worksheet_open_button = Button()
-        self.worksheet_open_button.Text = "Open Worksheet"
-        self.worksheet_open_button.Location = Point(115, 25)
-        self.worksheet_open_button.Size = Size(95, 25)  # Adjusted position and size
-        self.worksheet_open_button.BackColor = Color.LightBlue
-        self.worksheet_open_button.Click += self.worksheet_open_clicked
-        worksheet_group.Controls.Add(self.worksheet_open_button)
-        
-        self.worksheet_save_button = Button()
-        self.worksheet_save_button.Text = "Save As"
-        self.worksheet_save_button.Location = Point(220, 25)
-        self.worksheet_save_button.Size = Size(75, 25)  # Adjusted size
-        self.worksheet_save_button.BackColor = Color.LightYellow
-        self.worksheet_save_button.Click += self.worksheet_save_clicked
-        worksheet_group.Controls.Add(self.worksheet_save_button)
+        self.worksheet_new_button = self._mkbutton("New from Template", 10, 25, 95, 25, Color.LightGreen, self.worksheet_new_clicked)
+        controls.append(self.worksheet_new_button)
+        
+        self.worksheet_open_button = self._mkbutton("Open Worksheet", 115, 25, 95, 25, Color.LightBlue, self.worksheet_open_clicked)
+        controls.append(self.worksheet_open_button)
+        
+        self.worksheet_save_button = self._mkbutton("Save As", 220, 25, 75, 25, Color.LightYellow, self.worksheet_save_clicked)
+        controls.append(self.worksheet_save_button)
         
         # Worksheet operations row 2
-        self.worksheet_save_close_button = Button()
-        self.worksheet_save_close_button.Text = "Save & Close"
-        self.worksheet_save_close_button.Location = Point(10, 55)
-        self.worksheet_save_close_button.Size = Size(95, 25)
-        self.worksheet_save_close_button.BackColor = Color.Orange
-        self.worksheet_save_close_button.Click += self.worksheet_save_close_clicked
-        worksheet_group.Controls.Add(self.worksheet_save_close_button)
-        
-        self.delete_results_button = Button()
-        self.delete_results_button.Text = "Delete Results"
-        self.delete_results_button.Location = Point(115, 55)
-        self.delete_results_button.Size = Size(95, 25)
-        self.delete_results_button.BackColor = Color.LightCoral
-        self.delete_results_button.Click += self.delete_results_clicked
-        worksheet_group.Controls.Add(self.delete_results_button)
+        self.worksheet_save_close_button = self._mkbutton("Save & Close", 10, 55, 95, 25, Color.Orange, self.worksheet_save_close_clicked)
+        controls.append(self.worksheet_save_close_button)
+        
+        self.delete_results_button = self._mkbutton("Delete Results", 115, 55, 95, 25, Color.LightCoral, self.delete_results_clicked)
+        controls.append(self.delete_results_button)
         
         # LIMS Export section
-        lims_label = Label()
-        lims_label.Text = "LIMS Export:"
-        lims_label.Location = Point(10, 90)
-        lims_label.Size = Size(80, 20)
-        worksheet_group.Controls.Add(lims_label)
-        
-        self.lims_export_button = Button()
-        self.lims_export_button.Text = "LIMS Export"
-        self.lims_export_button.Location = Point(95, 85)
-        self.lims_export_button.Size = Size(90, 30)  # Adjusted size
-        self.lims_export_button.BackColor = Color.LightCyan
-        self.lims_export_button.Click += self.lims_export_clicked
-        worksheet_group.Controls.Add(self.lims_export_button)
-        
-        self.lims_location_button = Button()
-        self.lims_location_button.Text = "Set LIMS Location"
-        self.lims_location_button.Location = Point(195, 85)
-        self.lims_location_button.Size = Size(100, 30)  # Adjusted position
-        self.lims_location_button.BackColor = Color.LightPink
-        self.lims_location_button.Click += self.lims_location_clicked
-        worksheet_group.Controls.Add(self.lims_location_button)
+        controls.append(self._mklabel("LIMS Export:", 10, 90, 80, 20))
+        
+        self.lims_export_button = self._mkbutton("LIMS Export", 95, 85, 90, 30, Color.LightCyan, self.lims_export_clicked)
+        controls.append(self.lims_export_button)
+        
+        self.lims_location_button = self._mkbutton("Set LIMS Location", 195, 85, 100, 30, Color.LightPink, self.lims_location_clicked)
+        controls.append(self.lims_location_button)
 
-        self.Controls.Add(worksheet_group)
+        worksheet_group.Controls.AddRange(Array[Control](controls))
+        worksheet_group.ResumeLayout(False)
+        return worksheet_group
     
     def create_sample_panel(self):
         """Create sample management panel"""
         sample_group = GroupBox()
+        sample_group.SuspendLayout()
+        controls = []
         sample_group.Text = "Sample Management"
         sample_group.Location = Point(650, 10)  # Moved closer to left
         sample_group.Size = Size(280, 320)  # Reduced width and height
         
         # Sample list
-        sample_label = Label()
-        sample_label.Text = "Sample Queue:"
-        sample_label.Location = Point(10, 25)
-        sample_label.Size = Size(100, 20)
-        sample_group.Controls.Add(sample_label)
-        
-        self.sample_listbox = ListBox()
-        self.sample_listbox.Location = Point(10, 45)
-        self.sample_listbox.Size = Size(260, 140)  # Adjusted size
-        sample_group.Controls.Add(self.sample_listbox)
+        controls.append(self._mklabel("Sample Queue:", 10, 25, 100, 20))
+        
+        # Virtual list backed by self._samples - rows are only built when visible
+        self._samples = []
+        self.sample_listview = ListView()
+        self.sample_listview.Location = Point(10, 45)
+        self.sample_listview.Size = Size(260, 140)  # Adjusted size
+        self.sample_listview.View = View.Details
+        self.sample_listview.HeaderStyle = getattr(ColumnHeaderStyle, "None")  # "None" is a Python keyword
+        self.sample_listview.Columns.Add("Sample", 235)
+        self.sample_listview.FullRowSelect = True
+        self.sample_listview.MultiSelect = False
+        self.sample_listview.HideSelection = False
+        self.sample_listview.VirtualMode = True
+        self.sample_listview.VirtualListSize = 0
+        self.sample_listview.RetrieveVirtualItem += self.retrieve_sample_item
+        controls.append(self.sample_listview)
         
         # Sample selection for measurement
-        selection_label = Label()
-        selection_label.Text = "Sample Selection:"
-        selection_label.Location = Point(10, 195)
-        selection_label.Size = Size(120, 20)
-        sample_group.Controls.Add(selection_label)
-        
-        self.select_for_measurement_button = Button()
-        self.select_for_measurement_button.Text = "Select for Measurement"
-        self.select_for_measurement_button.Location = Point(10, 215)
-        self.select_for_measurement_button.Size = Size(125, 25)  # Adjusted size
-        self.select_for_measurement_button.BackColor = Color.LightSalmon
-        self.select_for_measurement_button.Click += self.select_for_measurement_clicked
-        sample_group.Controls.Add(self.select_for_measurement_button)
-        
-        self.deselect_for_measurement_button = Button()
-        self.deselect_for_measurement_button.Text = "Deselect"
-        self.deselect_for_measurement_button.Location = Point(145, 215)
-        self.deselect_for_measurement_button.Size = Size(75, 25)  # Adjusted size
-        self.deselect_for_measurement_button.BackColor = Color.LightGray
-        self.deselect_for_measurement_button.Click += self.deselect_for_measurement_clicked
-        sample_group.Controls.Add(self.deselect_for_measurement_button)
+        controls.append(self._mklabel("Sample Selection:", 10, 195, 120, 20))
+        
+        self.select_for_measurement_button = self._mkbutton("Select for Measurement", 10, 215, 125, 25, Color.LightSalmon, self.select_for_measurement_clicked)
+        controls.append(self.select_for_measurement_button)
+        
+        self.deselect_for_measurement_button = self._mkbutton("Deselect", 145, 215, 75, 25, Color.LightGray, self.deselect_for_measurement_clicked)
+        controls.append(self.deselect_for_measurement_button)
+        
+        # Re-query the worksheet samples, bypassing the sample list memo
+        self.refresh_samples_button = self._mkbutton("Refresh", 225, 215, 45, 25, handler=self.refresh_samples_clicked, enabled=False)
+        controls.append(self.refresh_samples_button)
         
         # Add sample controls
-        add_sample_label = Label()
-        add_sample_label.Text = "Add Sample:"
-        add_sample_label.Location = Point(10, 250)
-        add_sample_label.Size = Size(80, 20)
-        sample_group.Controls.Add(add_sample_label)
-        
-        self.sample_name_textbox = TextBox()
-        self.sample_name_textbox.Location = Point(10, 270)
-        self.sample_name_textbox.Size = Size(110, 20)  # Adjusted size
-        self.sample_name_textbox.Text = "Sample_001"
-        sample_group.Controls.Add(self.sample_name_textbox)
-        
-        self.add_sample_button = Button()
-        self.add_sample_button.Text = "Add"
-        self.add_sample_button.Location = Point(130, 268)
-        self.add_sample_button.Size = Size(40, 25)
-        self.add_sample_button.Click += self.add_sample_clicked
-        sample_group.Controls.Add(self.add_sample_button)
-        
-        self.clear_samples_button = Button()
-        self.clear_samples_button.Text = "Clear All"
-        self.clear_samples_button.Location = Point(180, 268)
-        self.clear_samples_button.Size = Size(60, 25)
-        self.clear_samples_button.Click += self.clear_samples_clicked
-        sample_group.Controls.Add(self.clear_samples_button)
-        
-        self.Controls.Add(sample_group)
+        controls.append(self._mklabel("Add Sample:", 10, 250, 80, 20))
+        
+        self.sample_name_textbox = self._mktextbox("Sample_001", 10, 270, 110, 20)
+        controls.append(self.sample_name_textbox)
+        
+        self.add_sample_button = self._mkbutton("Add", 130, 268, 40, 25, handler=self.add_sample_clicked)
+        controls.append(self.add_sample_button)
+        
+        self.clear_samples_button = self._mkbutton("Clear All", 180, 268, 60, 25, handler=self.clear_samples_clicked)
+        controls.append(self.clear_samples_button)
+        
+        sample_group.Controls.AddRange(Array[Control](controls))
+        sample_group.ResumeLayout(False)
+        return sample_group
     
     def create_advanced_panel(self):
         """Create advanced controls panel"""
         advanced_group = GroupBox()
+        advanced_group.SuspendLayout()
+        controls = []
         advanced_group.Text = "Advanced Controls"
         advanced_group.Location = Point(650, 340)  # Moved to align with sample panel
         advanced_group.Size = Size(280, 110)  # Adjusted width to match sample panel
         
         # Process samples button
-        self.process_samples_button = Button()
-        self.process_samples_button.Text = "Process All Samples"
-        self.process_samples_button.Location = Point(10, 25)
-        self.process_samples_button.Size = Size(125, 30)  # Adjusted size
-        self.process_samples_button.BackColor = Color.LightGreen
-        self.process_samples_button.Click += self.process_samples_clicked
-        advanced_group.Controls.Add(self.process_samples_button)
+        self.process_samples_button = self._mkbutton("Process All Samples", 10, 25, 125, 30, Color.LightGreen, self.process_samples_clicked)
+        controls.append(self.process_samples_button)
         
         # Export results button
-        self.export_button = Button()
-        self.export_button.Text = "Export Results"
-        self.export_button.Location = Point(145, 25)
-        self.export_button.Size = Size(95, 30)  # Adjusted size
-        self.export_button.Click += self.export_clicked
-        advanced_group.Controls.Add(self.export_button)
+        self.export_button = self._mkbutton("Export Results", 145, 25, 95, 30, handler=self.export_clicked)
+        controls.append(self.export_button)
         
         # Output location button
-        self.output_location_button = Button()
-        self.output_location_button.Text = "Set Output Location"
-        self.output_location_button.Location = Point(10, 65)
-        self.output_location_button.Size = Size(115, 25)  # Adjusted size
-        self.output_location_button.BackColor = Color.LightYellow
-        self.output_location_button.Click += self.output_location_clicked
-        advanced_group.Controls.Add(self.output_location_button)
+        self.output_location_button = self._mkbutton("Set Output Location", 10, 65, 115, 25, Color.LightYellow, self.output_location_clicked)
+        controls.append(self.output_location_button)
         
         # Load worksheet template button
-        self.load_template_button = Button()
-        self.load_template_button.Text = "Load Template/Worksheet"
-        self.load_template_button.Location = Point(135, 65)
-        self.load_template_button.Size = Size(125, 25)  # Adjusted size
-        self.load_template_button.BackColor = Color.LightCyan
-        self.load_template_button.Click += self.load_template_clicked
-        advanced_group.Controls.Add(self.load_template_button)
+        self.load_template_button = self._mkbutton("Load Template/Worksheet", 135, 65, 125, 25, Color.LightCyan, self.load_template_clicked)
+        controls.append(self.load_template_button)
         
-        self.Controls.Add(advanced_group)
+        advanced_group.Controls.AddRange(Array[Control](controls))
+        advanced_group.ResumeLayout(False)
+        return advanced_group
     
     def create_log_panel(self):
         """Create log/message panel"""
         log_group = GroupBox()
+        log_group.SuspendLayout()
+        controls = []
         log_group.Text = "Activity Log"
         log_group.Location = Point(10, 460)  # Moved up to fit in smaller window
         log_group.Size = Size(920, 250)  # Reduced size for optimized layout
@@ -557,117 +910,130 @@ class InstrumentControlGUI(Form):
         self.log_textbox.Location = Point(10, 20)
         self.log_textbox.Size = Size(900, 200)  # Adjusted for new panel size
         self.log_textbox.ReadOnly = True
-        log_group.Controls.Add(self.log_textbox)
-        
-        self.clear_log_button = Button()
-        self.clear_log_button.Text = "Clear Log"
-        self.clear_log_button.Location = Point(10, 225)
-        self.clear_log_button.Size = Size(80, 25)
-        self.clear_log_button.Click += self.clear_log_clicked
-        log_group.Controls.Add(self.clear_log_button)
+        # AppendText honours MaxLength (default 32767); size it above LOG_MAX_CHARS
+        self.log_textbox.MaxLength = 65536
+        controls.append(self.log_textbox)
+        
+        # Log messages are buffered and flushed to the TextBox in one append per tick
+        self._log_buf = StringBuilder()
+        self._log_lines = deque(maxlen=LOG_MAX_LINES)
+        self._log_lock = threading.Lock()
+        self._log_flush_timer = Timer()
+        self._log_flush_timer.Interval = LOG_FLUSH_INTERVAL_MS
+        self._log_flush_timer.Tick += self.flush_log
+        self._log_flush_timer.Start()
+        
+        self.clear_log_button = self._mkbutton("Clear Log", 10, 225, 80, 25, handler=self.clear_log_clicked)
+        controls.append(self.clear_log_button)
         
         # Debug button to list available methods
-        self.debug_button = Button()
-        self.debug_button.Text = "Debug Methods"
-        self.debug_button.Location = Point(100, 225)
-        self.debug_button.Size = Size(100, 25)
-        self.debug_button.Click += self.debug_methods_clicked
-        log_group.Controls.Add(self.debug_button)
+        self.debug_button = self._mkbutton("Debug Methods", 100, 225, 100, 25, handler=self.debug_methods_clicked)
+        controls.append(self.debug_button)
         
-        self.Controls.Add(log_group)
+        # Refresh version, status and samples in one go
+        self.refresh_all_button = self._mkbutton("Refresh All", 210, 225, 100, 25, handler=self.refresh_all_clicked, enabled=False)
+        controls.append(self.refresh_all_button)
+        
+        log_group.Controls.AddRange(Array[Control](controls))
+        log_group.ResumeLayout(False)
+        return log_group
+    
+    def _timestamp(self):
+        """Return the log timestamp, formatting it at most once per second"""
+        now = int(time.time())
+        cached_sec, cached_str = self._ts_cache
+        if now != cached_sec:
+            cached_str = time.strftime("%H:%M:%S", time.localtime(now))
+            self._ts_cache = (now, cached_str)
+        return cached_str
     
     def log_message(self, message):
-        """Add message to log panel"""
-        timestamp = time.strftime("%H:%M:%S")
-        log_entry = "[{0}] {1}\r\n".format(timestamp, message)
-        self.log_textbox.AppendText(log_entry)
-        
-        # Keep log size manageable
-        if len(self.log_textbox.Text) > 10000:
-            lines = self.log_textbox.Lines
-            self.log_textbox.Lines = lines[-100:]  # Keep last 100 lines
+        """Add message to log panel (buffered until the next flush_log tick)"""
+        log_entry = "[{0}] {1}\r\n".format(self._timestamp(), message)
+        with self._log_lock:
+            self._log_buf.Append(log_entry)
+    
+    def log_lines(self, messages):
+        """Add several messages to log panel under one timestamp and one lock"""
+        prefix = "[{0}] ".format(self._timestamp())
+        with self._log_lock:
+            for message in messages:
+                self._log_buf.Append(prefix).Append(message).Append("\r\n")
+    
+    def _logf(self, fmt, *args):
+        """Add a formatted message to log panel - fmt uses .NET {0}-style placeholders"""
+        timestamp = self._timestamp()
+        with self._log_lock:
+            self._log_buf.Append("[").Append(timestamp).Append("] ").AppendFormat(fmt, *args).Append("\r\n")
+    
+    def flush_log(self, sender, e):
+        """Append all buffered log messages to the log panel in a single update"""
+        with self._log_lock:
+            if self._log_buf.Length == 0:
+                return
+            pending = self._log_buf.ToString()
+            self._log_buf.Length = 0
+        
+        self._log_lines.extend(pending.split("\r\n")[:-1])
+        
+        # Keep log size manageable - rebuild from the ring buffer once too large
+        if self.log_textbox.TextLength + len(pending) > LOG_MAX_CHARS:
+            # Keep only the newest lines that fit in LOG_TRIM_CHARS - long lines could
+            # otherwise leave the rebuilt text over the limit and rebuild on every flush
+            kept = []
+            budget = LOG_TRIM_CHARS
+            for line in reversed(self._log_lines):
+                budget -= len(line) + 2
+                if budget < 0:
+                    break
+                kept.append(line)
+            kept.reverse()
+            self._log_lines.clear()
+            self._log_lines.extend(kept)
+            self.log_textbox.Text = "\r\n".join(kept) + "\r\n" if kept else ""
+            self.log_textbox.SelectionStart = self.log_textbox.TextLength
+            self.log_textbox.ScrollToCaret()
+        else:
+            self.log_textbox.AppendText(pending)
     
     def enable_controls(self, enabled):
         """Enable/disable instrument control buttons"""
-        # Basic controls
-        self.plasma_on_button.Enabled = enabled
-        self.plasma_off_button.Enabled = enabled
-        self.pump_off_button.Enabled = enabled
-        self.pump_slow_button.Enabled = enabled
-        self.pump_fast_button.Enabled = enabled
-        self.purge_on_button.Enabled = enabled
-        self.purge_off_button.Enabled = enabled
-        self.start_button.Enabled = enabled
-        self.stop_button.Enabled = enabled
-        self.show_ui_button.Enabled = enabled
-        self.hide_ui_button.Enabled = enabled
-        self.process_samples_button.Enabled = enabled
-        self.export_button.Enabled = enabled
-        
-        # Worksheet controls
-        self.worksheet_new_button.Enabled = enabled
-        self.worksheet_open_button.Enabled = enabled
-        self.worksheet_save_button.Enabled = enabled
-        self.worksheet_save_close_button.Enabled = enabled
-        self.delete_results_button.Enabled = enabled  # Fixed button name
-        self.lims_export_button.Enabled = enabled
-        
-        # Sample controls
-        self.select_for_measurement_button.Enabled = enabled  # Fixed button name
-        
-        # Always enabled controls
-        self.output_location_button.Enabled = True
-        self.load_template_button.Enabled = True
-        self.lims_location_button.Enabled = True  # Fixed button name
+        self.SuspendLayout()
+        try:
+            for control in self._conn_gated_controls:
+                control.Enabled = enabled
+            for control in self._always_on_controls:
+                control.Enabled = True
+        finally:
+            self.ResumeLayout(False)
     
     # Event handlers
     def connect_clicked(self, sender, e):
         """Handle connect button click"""
         try:
-            host = self.host_textbox.Text
-            port_text = self.port_textbox.Text
-            
-            # Validate port number
-            try:
-                port = int(port_text)
-                if port < 1 or port > 65535:
-                    raise ValueError("Port must be between 1 and 65535")
-            except ValueError as ve:
-                self.log_message("Invalid port number: {0}".format(port_text))
-                MessageBox.Show("Invalid port number: {0}".format(str(ve)), "Input Error", 
+            # Host and port were parsed when the textboxes were validated
+            host = self._host_cached
+            port = self._port_cached
+            if host is None or port is None:
+                self._logf("Invalid connection settings: {0}:{1}", self.host_textbox.Text, self.port_textbox.Text)
+                MessageBox.Show("Please correct the highlighted host/port fields", "Input Error", 
                               MessageBoxButtons.OK, MessageBoxIcon.Error)
                 return
             
-            self.log_message("Connecting to {0}:{1}...".format(host, port))
-            
-            # Clean up any existing connection
-            if self.client:
-                try:
-                    self.client.Dispose()
-                except:
-                    pass  # Ignore cleanup errors
-            
-            self.client = Automation()
+            self._logf("Connecting to {0}:{1}...", host, port)
             
-            # Connect and check if connection was successful
+            # Connect (reusing the existing client) and check if connection was successful
             self.client.Connect(host, port)
             
-            # Check connection state from the client
-            if hasattr(self.client.Client, 'State') and hasattr(self.client.Client.State, 'Connected'):
-                # For XdrSocketClient, check the State property
-                connected = (self.client.Client.State.value__ == 1)  # Connected state
-            else:
-                # Fallback: assume connected if no exception was thrown
-                connected = True
-            
-            if connected:
+            if self._is_connected():
                 self.connected = True
+                self._probe_client_capabilities()
                 self.connection_status.Text = "Connected"
                 self.connection_status.ForeColor = Color.Green
                 self.connect_button.Enabled = False
                 self.disconnect_button.Enabled = True
                 self.enable_controls(True)
-                self.status_timer.Start()
+                self.start_status_polling()
                 self.log_message("Successfully connected to instrument")
             else:
                 self.log_message("Failed to connect to instrument")
@@ -676,12 +1042,12 @@ class InstrumentControlGUI(Form):
                 
         except Exception as ex:
             error_msg = str(ex)
-            if "SocketException" in error_msg or "connection" in error_msg.lower():
-                self.log_message("Connection failed: Unable to reach instrument at {0}:{1}".format(host, port_text))
+            if _is_socket_error(ex) or "connection" in error_msg.lower():
+                self._logf("Connection failed: Unable to reach instrument at {0}:{1}", self.host_textbox.Text, self.port_textbox.Text)
                 MessageBox.Show("Cannot connect to instrument.\n\nPlease check:\n- MP Expert is running\n- Host/Port are correct\n- Network connectivity", "Connection Failed", 
                               MessageBoxButtons.OK, MessageBoxIcon.Warning)
             else:
-                self.log_message("Connection error: {0}".format(error_msg))
+                self._logf("Connection error: {0}", error_msg)
                 MessageBox.Show("Connection error: {0}".format(error_msg), "Error", 
                               MessageBoxButtons.OK, MessageBoxIcon.Error)
     
@@ -690,153 +1056,165 @@ class InstrumentControlGUI(Form):
         try:
             if self.client and self.connected:
                 # Stop the status timer first to prevent further communication
-                if self.status_timer:
-                    self.status_timer.Stop()
+                self.stop_status_polling()
                 
                 self.log_message("Disconnecting from instrument...")
                 
-                # Attempt graceful disconnect
-                try:
-                    self.client.Disconnect()
-                except Exception as disconnect_ex:
-                    # Log the socket error but continue with cleanup
-                    self.log_message("Socket disconnect warning: {0}".format(str(disconnect_ex)))
-                    # This is expected when the connection is already broken
-                
-                # Clean up resources
-                try:
-                    self.client.Dispose()
-                except Exception as dispose_ex:
-                    self.log_message("Resource cleanup warning: {0}".format(str(dispose_ex)))
-                
-                # Update UI state
+                # Update UI state right away - the SDK call runs on the thread pool
                 self.connected = False
-                self.connection_status.Text = "Not Connected"
-                self.connection_status.ForeColor = Color.Red
-                self.connect_button.Enabled = True
+                self._clear_caps()
+                self.connection_status.Text = "Disconnecting..."
+                self.connection_status.ForeColor = Color.Orange
+                self.connect_button.Enabled = False  # Re-enabled by _finish_disconnect
                 self.disconnect_button.Enabled = False
                 self.enable_controls(False)
-                self.log_message("Disconnected from instrument successfully")
+                
+                # Not queued behind other commands - a hung command or a full queue would
+                # otherwise leave the form disabled with no way to reconnect
+                ThreadPool.QueueUserWorkItem(WaitCallback(self._disconnect_bg))
                 
         except Exception as ex:
-            self.log_message("Disconnect error: {0}".format(str(ex)))
+            self._logf("Disconnect error: {0}", str(ex))
     
-    def plasma_on_clicked(self, sender, e):
-        """Handle plasma ignite button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PlasmaOn()
-                self.log_message("Plasma ignition command sent")
-            except Exception as ex:
-                self.log_message("Plasma ignition error: {0}".format(str(ex)))
+    def _disconnect_bg(self, state):
+        """Disconnect on a worker thread, disposing the client if Disconnect hangs"""
+        client = self.client
+        replacement = None
+        try:
+            finished, error = _call_with_timeout(client.Disconnect, DISCONNECT_TIMEOUT_MS)
+            if not finished:
+                self._logf("Disconnect timed out after {0} ms - closing the connection", DISCONNECT_TIMEOUT_MS)
+                # Abort the pending socket; a disposed client cannot be reused
+                try:
+                    client.Dispose()
+                except Exception:
+                    pass
+                replacement = Automation()
+            elif error is not None:
+                # Log the socket error but continue with cleanup
+                # This is expected when the connection is already broken
+                self._logf("Socket disconnect warning: {0}", str(error))
+        except Exception as ex:
+            self._logf("Disconnect error: {0}", str(ex))
+        
+        # Always hand the UI back, whatever happened above
+        self._post_to_ui(lambda: self._finish_disconnect(replacement))
     
-    def plasma_off_clicked(self, sender, e):
-        """Handle plasma extinguish button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PlasmaOff()
-                self.log_message("Plasma extinguish command sent")
-            except Exception as ex:
-                self.log_message("Plasma extinguish error: {0}".format(str(ex)))
+    def _finish_disconnect(self, replacement=None):
+        """Apply the disconnect result (runs on the UI thread)"""
+        if replacement is not None:
+            self._adopt_client(replacement)
+        
+        self.connection_status.Text = "Not Connected"
+        self.connection_status.ForeColor = Color.Red
+        self.connect_button.Enabled = True
+        self.log_message("Disconnected from instrument successfully")
     
-    def pump_off_clicked(self, sender, e):
-        """Handle pump off button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PumpOff()
-                self.log_message("Pump turned off")
-            except Exception as ex:
-                self.log_message("Pump control error: {0}".format(str(ex)))
+    # Simple instrument command handlers: (SDK method, success message, error template)
+    plasma_on_clicked = _command_handler('PlasmaOn', LOG_PLASMA_ON, LOG_ERR_PLASMA_ON)
+    plasma_off_clicked = _command_handler('PlasmaOff', LOG_PLASMA_OFF, LOG_ERR_PLASMA_OFF)
+    pump_off_clicked = _command_handler('PumpOff', LOG_PUMP_OFF, LOG_ERR_PUMP)
+    pump_slow_clicked = _command_handler('PumpSlow', LOG_PUMP_SLOW, LOG_ERR_PUMP)
+    pump_fast_clicked = _command_handler('PumpFast', LOG_PUMP_FAST, LOG_ERR_PUMP)
+    purge_on_clicked = _command_handler('PurgeOn', LOG_PURGE_ON, LOG_ERR_PURGE)
+    purge_off_clicked = _command_handler('PurgeOff', LOG_PURGE_OFF, LOG_ERR_PURGE)
+    start_clicked = _command_handler('Start', LOG_START, LOG_ERR_START)
+    stop_clicked = _command_handler('Stop', LOG_STOP, LOG_ERR_STOP)
     
-    def pump_slow_clicked(self, sender, e):
-        """Handle pump slow button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PumpSlow()
-                self.log_message("Pump set to slow speed")
-            except Exception as ex:
-                self.log_message("Pump control error: {0}".format(str(ex)))
+    def _post_command(self, name, call, done_msg, error_fmt):
+        """Queue an SDK call for the command worker - error_fmt gets the error as {0}"""
+        try:
+            self.cmd_queue.put_nowait((name, call, done_msg, error_fmt, self._conn_generation))
+        except Full:
+            self._logf("Command queue full - {0} dropped", name)
     
-    def pump_fast_clicked(self, sender, e):
-        """Handle pump fast button click"""
-        if self.client and self.connected:
+    def _cmd_worker(self):
+        """Run queued SDK commands in order until the None sentinel arrives"""
+        while True:
+            item = self.cmd_queue.get()
+            if item is None:
+                break
+            name, call, done_msg, error_fmt, generation = item
+            if not self.connected:
+                self._logf("{0} skipped - not connected", name)
+                continue
+            if generation != self._conn_generation:
+                # Queued before a disconnect - never replay it on a later connection
+                self._logf("{0} skipped - queued on an earlier connection", name)
+                continue
             try:
-                self.client.PumpFast()
-                self.log_message("Pump set to fast speed")
+                call()
+                if done_msg:
+                    self.log_message(done_msg)  # log_message is safe off the UI thread
             except Exception as ex:
-                self.log_message("Pump control error: {0}".format(str(ex)))
+                self._logf(error_fmt, str(ex))
     
-    def purge_on_clicked(self, sender, e):
-        """Handle purge on button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PurgeOn()
-                self.log_message("N2 purge enabled")
-            except Exception as ex:
-                self.log_message("Purge control error: {0}".format(str(ex)))
+    def retrieve_sample_item(self, sender, e):
+        """Supply the virtual sample list row at e.ItemIndex"""
+        e.Item = ListViewItem(self._samples[e.ItemIndex])
     
-    def purge_off_clicked(self, sender, e):
-        """Handle purge off button click"""
-        if self.client and self.connected:
-            try:
-                self.client.PurgeOff()
-                self.log_message("N2 purge disabled")
-            except Exception as ex:
-                self.log_message("Purge control error: {0}".format(str(ex)))
+    def _refresh_sample_view(self):
+        """Resize the virtual sample list to match self._samples and repaint it"""
+        self.sample_listview.VirtualListSize = len(self._samples)
+        self.sample_listview.Invalidate()
     
-    def start_clicked(self, sender, e):
-        """Handle start measurement button click"""
-        if self.client and self.connected:
-            try:
-                self.client.Start()
-                self.log_message("Measurement started")
-            except Exception as ex:
-                self.log_message("Start measurement error: {0}".format(str(ex)))
+    def _clear_samples(self):
+        """Empty the sample queue (call _refresh_sample_view afterwards)"""
+        self.sample_listview.SelectedIndices.Clear()
+        del self._samples[:]
     
-    def stop_clicked(self, sender, e):
-        """Handle stop measurement button click"""
-        if self.client and self.connected:
-            try:
-                self.client.Stop()
-                self.log_message("Measurement stopped")
-            except Exception as ex:
-                self.log_message("Stop measurement error: {0}".format(str(ex)))
+    def _populate_samples(self, names):
+        """Replace the sample queue with names and repaint the list once"""
+        self._clear_samples()
+        self._samples.extend(names)
+        self._sample_counter = len(self._samples)
+        self._refresh_sample_view()
     
     def add_sample_clicked(self, sender, e):
         """Handle add sample button click"""
         sample_name = self.sample_name_textbox.Text.strip()
         if sample_name:
-            self.sample_listbox.Items.Add(sample_name)
-            self.sample_name_textbox.Text = "Sample_{0:03d}".format(self.sample_listbox.Items.Count + 1)
-            self.log_message("Added sample: {0}".format(sample_name))
+            self._samples.append(sample_name)
+            self._sample_counter += 1
+            self._refresh_sample_view()
+            self.sample_name_textbox.Text = _sample_name(self._sample_counter + 1)
+            self._logf("Added sample: {0}", sample_name)
     
     def clear_samples_clicked(self, sender, e):
         """Handle clear samples button click"""
-        self.sample_listbox.Items.Clear()
+        self._populate_samples([])
         self.log_message("Sample queue cleared")
     
     def process_samples_clicked(self, sender, e):
         """Handle process all samples button click"""
         if self.client and self.connected:
-            if self.sample_listbox.Items.Count == 0:
+            if not self._samples:
                 MessageBox.Show("No samples in queue", "Warning", 
                               MessageBoxButtons.OK, MessageBoxIcon.Warning)
                 return
             
-            try:
-                self.log_message("Processing {0} samples...".format(self.sample_listbox.Items.Count))
-                
-                for i in range(self.sample_listbox.Items.Count):
-                    sample_name = self.sample_listbox.Items[i]
-                    self.log_message("Processing sample: {0}".format(sample_name))
-                    self.client.SelectSolution(sample_name, True)
-                    time.sleep(0.5)  # Brief delay between selections
-                
+            names = list(self._samples)
+            batch_select = self._caps.get('SelectSolutions')
+            self._logf("Processing {0} samples...", len(names))
+            
+            def process():
+                # Runs on the command worker, in order with any Start/Stop queued before it
+                if batch_select:
+                    # One round-trip for the whole queue
+                    self.client.SelectSolutions(names, True)
+                else:
+                    # Send the selections back-to-back, no delay in between
+                    for index, sample_name in enumerate(names):
+                        try:
+                            self.client.SelectSolution(sample_name, True)
+                        except Exception as ex:
+                            self._logf("Batch processing error at sample {0} ({1}): {2}",
+                                       index + 1, sample_name, str(ex))
+                            return
                 self.client.Start()
                 self.log_message("Batch measurement started")
-                
-            except Exception as ex:
-                self.log_message("Batch processing error: {0}".format(str(ex)))
+            
+            self._post_command("Process samples", process, None, "Batch processing error: {0}")
     
     def export_clicked(self, sender, e):
         """Handle export results button click"""
@@ -851,93 +1229,124 @@ class InstrumentControlGUI(Form):
                     export_path = os.path.join(self.output_path, filename)
                 else:
                     export_path = filename
-                
-                self.client.Export(export_path)
-                self.log_message("Results exported successfully!")
-                self.log_message("File saved to: {0}".format(export_path))
-                MessageBox.Show("Results exported successfully!\n\nFile saved to:\n{0}".format(export_path), "Export Complete", 
-                              MessageBoxButtons.OK, MessageBoxIcon.Information)
             except Exception as ex:
-                self.log_message("Export error: {0}".format(str(ex)))
+                self._logf(LOG_ERR_EXPORT, str(ex))
+                return
+            
+            def export():
+                self._export_to(export_path)
+                self.log_message("Results exported successfully!")
+                self._logf("File saved to: {0}", export_path)
+                self._show_info_async("Results exported successfully!\n\nFile saved to:\n{0}".format(export_path),
+                                      "Export Complete")
+            
+            self._post_command("Export", export, None, LOG_ERR_EXPORT)
+    
+    def _export_to(self, path):
+        """Export results to path - runs on the command worker"""
+        if self._caps and self._caps.get('ExportToStream'):
+            # Let the SDK write straight into an asynchronous file stream
+            stream = FileStream(path, FileMode.Create, FileAccess.Write, getattr(FileShare, "None"),
+                                EXPORT_BUFFER_SIZE, FileOptions.Asynchronous)
+            try:
+                self.client.ExportToStream(stream)
+            finally:
+                stream.Dispose()
+        else:
+            self.client.Export(path)
+    
+    def _show_info_async(self, text, caption):
+        """Show an information box on the UI thread without waiting for it"""
+        self._post_to_ui(lambda: MessageBox.Show(text, caption, MessageBoxButtons.OK, MessageBoxIcon.Information))
     
     def clear_log_clicked(self, sender, e):
         """Handle clear log button click"""
+        with self._log_lock:
+            self._log_buf.Length = 0
+        self._log_lines.clear()
         self.log_textbox.Clear()
     
     def debug_methods_clicked(self, sender, e):
         """Handle debug methods button click - lists available client methods"""
         if self.client:
-            try:
-                self.log_message("=== Available Client Methods ===")
-                methods = [method for method in dir(self.client) if not method.startswith('_')]
-                methods.sort()
-                
-                # Show methods in groups
-                ui_methods = [m for m in methods if 'ui' in m.lower() or 'show' in m.lower() or 'hide' in m.lower()]
-                if ui_methods:
-                    self.log_message("UI Methods: {0}".format(', '.join(ui_methods)))
-                
-                # Show all methods in chunks to avoid overwhelming the log
-                chunk_size = 15
-                for i in range(0, len(methods), chunk_size):
-                    chunk = methods[i:i+chunk_size]
-                    self.log_message("Methods {0}-{1}: {2}".format(i+1, min(i+chunk_size, len(methods)), ', '.join(chunk)))
-                
-                self.log_message("=== End Method List ===")
-                
-            except Exception as ex:
-                self.log_message("Debug methods error: {0}".format(str(ex)))
+            if self._debug_methods_cache is None and self._members is not None:
+                # The member names were already listed for this connection
+                self._debug_methods_cache = self._format_method_listing(sorted(self._members))
+            if self._debug_methods_cache is not None:
+                self._log_debug_methods()
+            else:
+                # Reflecting over the client is slow - build the listing once, off the UI thread
+                ThreadPool.QueueUserWorkItem(WaitCallback(self._build_debug_cache_bg))
         else:
             self.log_message("No client connected - connect first to see available methods")
     
+    def _build_debug_cache_bg(self, state):
+        """Build and log the client method listing on a worker thread"""
+        try:
+            methods = sorted(self._member_names())
+            self._debug_methods_cache = self._format_method_listing(methods)
+            self._log_debug_methods()
+        except Exception as ex:
+            self._logf("Debug methods error: {0}", str(ex))
+    
+    def _format_method_listing(self, methods):
+        """Build the debug log lines for a sorted list of method names"""
+        lines = ["=== Available Client Methods ==="]
+        
+        # Show methods in groups
+        ui_methods = [m for m in methods if 'ui' in m.lower() or 'show' in m.lower() or 'hide' in m.lower()]
+        if ui_methods:
+            lines.append("UI Methods: {0}".format(', '.join(ui_methods)))
+        
+        # Show all methods in chunks to avoid overwhelming the log
+        chunk_size = 15
+        for i in range(0, len(methods), chunk_size):
+            chunk = methods[i:i+chunk_size]
+            lines.append("Methods {0}-{1}: {2}".format(i+1, min(i+chunk_size, len(methods)), ', '.join(chunk)))
+        lines.append("=== End Method List ===")
+        return lines
+    
+    def _log_debug_methods(self):
+        """Log the cached method listing"""
+        # The listing is built once, header and footer included
+        self.log_lines(self._debug_methods_cache)
+    
     def show_ui_clicked(self, sender, e):
         """Handle show MP Expert UI button click"""
         if self.client and self.connected:
             try:
-                # Check if the method exists first
-                if hasattr(self.client, 'ShowUI'):
-                    self.client.ShowUI()
-                    self.log_message("MP Expert UI shown")
-                elif hasattr(self.client, 'ShowUserInterface'):
-                    self.client.ShowUserInterface()
-                    self.log_message("MP Expert UI shown")
-                elif hasattr(self.client, 'Show'):
-                    self.client.Show()
+                # Method resolved when the connection was made
+                fn = self._show_ui_fn
+                if fn:
+                    fn()
                     self.log_message("MP Expert UI shown")
                 else:
                     # List available methods for debugging
-                    methods = [method for method in dir(self.client) if not method.startswith('_')]
-                    self.log_message("ShowUI method not found. Available methods: {0}".format(', '.join(methods[:10])))
+                    methods = self._member_names()
+                    self._logf("ShowUI method not found. Available methods: {0}", ', '.join(methods[:10]))
                     self.log_message("Please check the Automation SDK documentation for the correct method name")
             except Exception as ex:
-                self.log_message("Show UI error: {0}".format(str(ex)))
+                self._logf("Show UI error: {0}", str(ex))
     
     def hide_ui_clicked(self, sender, e):
         """Handle hide MP Expert UI button click"""
         if self.client and self.connected:
             try:
-                # Check if the method exists first
-                if hasattr(self.client, 'HideUI'):
-                    self.client.HideUI()
-                    self.log_message("MP Expert UI hidden")
-                elif hasattr(self.client, 'HideUserInterface'):
-                    self.client.HideUserInterface()
-                    self.log_message("MP Expert UI hidden")
-                elif hasattr(self.client, 'Hide'):
-                    self.client.Hide()
+                # Method resolved when the connection was made
+                fn = self._hide_ui_fn
+                if fn:
+                    fn()
                     self.log_message("MP Expert UI hidden")
                 else:
                     # List available methods for debugging
-                    methods = [method for method in dir(self.client) if not method.startswith('_')]
-                    self.log_message("HideUI method not found. Available methods: {0}".format(', '.join(methods[:10])))
+                    methods = self._member_names()
+                    self._logf("HideUI method not found. Available methods: {0}", ', '.join(methods[:10]))
                     self.log_message("Please check the Automation SDK documentation for the correct method name")
             except Exception as ex:
-                self.log_message("Hide UI error: {0}".format(str(ex)))
+                self._logf("Hide UI error: {0}", str(ex))
     
     def output_location_clicked(self, sender, e):
         """Handle output location selection button click"""
-        from System.Windows.Forms import FolderBrowserDialog, DialogResult
-        
         folder_dialog = FolderBrowserDialog()
         folder_dialog.Description = "Select Output Location for Results"
         if self.output_path:
@@ -945,14 +1354,12 @@ class InstrumentControlGUI(Form):
         
         if folder_dialog.ShowDialog() == DialogResult.OK:
             self.output_path = folder_dialog.SelectedPath
-            self.log_message("Output location set to: {0}".format(self.output_path))
+            self._logf("Output location set to: {0}", self.output_path)
             MessageBox.Show("Output location set to:\n{0}".format(self.output_path), "Output Location Set", 
                           MessageBoxButtons.OK, MessageBoxIcon.Information)
     
     def load_template_clicked(self, sender, e):
         """Handle load worksheet template button click"""
-        from System.Windows.Forms import OpenFileDialog, DialogResult
-        
         file_dialog = OpenFileDialog()
         file_dialog.Title = "Select Template or Worksheet"
         file_dialog.Filter = "MP Expert Templates (*.mpts)|*.mpts|MP Expert Worksheets (*.mpws)|*.mpws|All Files (*.*)|*.*"
@@ -961,73 +1368,44 @@ class InstrumentControlGUI(Form):
         if file_dialog.ShowDialog() == DialogResult.OK:
             self.template_path = file_dialog.FileName
             file_type = "Template" if self.template_path.lower().endswith('.mpts') else "Worksheet" if self.template_path.lower().endswith('.mpws') else "File"
-            self.log_message("{0} selected: {1}".format(file_type, self.template_path))
+            self._logf("{0} selected: {1}", file_type, self.template_path)
             
             # Actually load the template/worksheet into MP Expert
             if self.client and self.connected:
                 try:
-                    self.log_message("Loading {0} into MP Expert...".format(file_type.lower()))
+                    self._logf("Loading {0} into MP Expert...", file_type.lower())
                     
-                    # Try different possible methods to load the file
+                    # Loader method resolved when the connection was made
                     loaded = False
-                    
-                    # Method 1: Try LoadTemplate
-                    if hasattr(self.client, 'LoadTemplate'):
-                        self.client.LoadTemplate(self.template_path)
-                        loaded = True
-                        self.log_message("{0} loaded successfully using LoadTemplate".format(file_type))
-                    
-                    # Method 2: Try LoadWorksheet  
-                    elif hasattr(self.client, 'LoadWorksheet'):
-                        self.client.LoadWorksheet(self.template_path)
-                        loaded = True
-                        self.log_message("{0} loaded successfully using LoadWorksheet".format(file_type))
-                    
-                    # Method 3: Try LoadFile
-                    elif hasattr(self.client, 'LoadFile'):
-                        self.client.LoadFile(self.template_path)
-                        loaded = True
-                        self.log_message("{0} loaded successfully using LoadFile".format(file_type))
-                    
-                    # Method 4: Try OpenFile
-                    elif hasattr(self.client, 'OpenFile'):
-                        self.client.OpenFile(self.template_path)
+                    if self._load_fn:
+                        self._load_fn(self.template_path)
                         loaded = True
-                        self.log_message("{0} loaded successfully using OpenFile".format(file_type))
-                    
-                    # Method 5: Try Load
-                    elif hasattr(self.client, 'Load'):
-                        self.client.Load(self.template_path)
-                        loaded = True
-                        self.log_message("{0} loaded successfully using Load".format(file_type))
+                        self._logf("{0} loaded successfully using {1}", file_type, self._load_name)
                     
                     if loaded:
                         MessageBox.Show("{0} loaded successfully into MP Expert!\n\nFile: {1}".format(file_type, self.template_path), "{0} Loaded".format(file_type), 
                                       MessageBoxButtons.OK, MessageBoxIcon.Information)
                         
                         # Try to detect samples in the loaded file
+                        self._worksheet_changed()
                         self.detect_worksheet_samples()
                         
                         # Show the MP Expert UI if it's hidden
                         try:
-                            if hasattr(self.client, 'ShowUI'):
-                                self.client.ShowUI()
-                            elif hasattr(self.client, 'ShowUserInterface'):
-                                self.client.ShowUserInterface()
-                            elif hasattr(self.client, 'Show'):
-                                self.client.Show()
+                            if self._show_ui_fn:
+                                self._show_ui_fn()
                         except Exception as show_ex:
-                            self.log_message("Note: Could not show UI automatically: {0}".format(str(show_ex)))
+                            self._logf("Note: Could not show UI automatically: {0}", str(show_ex))
                     
                     else:
                         # No suitable method found
-                        available_methods = [method for method in dir(self.client) if not method.startswith('_') and ('load' in method.lower() or 'open' in method.lower())]
-                        self.log_message("No suitable load method found. Available load/open methods: {0}".format(', '.join(available_methods)))
+                        available_methods = [method for method in self._member_names() if 'load' in method.lower() or 'open' in method.lower()]
+                        self._logf("No suitable load method found. Available load/open methods: {0}", ', '.join(available_methods))
                         MessageBox.Show("Could not load {0}.\n\nNo suitable load method found in the Automation SDK.\nAvailable methods: {1}".format(file_type.lower(), ', '.join(available_methods[:5])), "Load Failed", 
                                       MessageBoxButtons.OK, MessageBoxIcon.Warning)
                         
                 except Exception as ex:
-                    self.log_message("{0} loading error: {1}".format(file_type, str(ex)))
+                    self._logf("{0} loading error: {1}", file_type, str(ex))
                     MessageBox.Show("Error loading {0}:\n\n{1}".format(file_type.lower(), str(ex)), "Load Error", 
                                   MessageBoxButtons.OK, MessageBoxIcon.Error)
             else:
@@ -1035,175 +1413,220 @@ class InstrumentControlGUI(Form):
                 MessageBox.Show("{0} selected:\n{1}\n\nConnect to instrument to load the file into MP Expert.".format(file_type, self.template_path), "{0} Selected".format(file_type), 
                               MessageBoxButtons.OK, MessageBoxIcon.Information)
     
-    def update_status(self, sender, e):
-        """Update instrument status display"""
-        if self.client and self.connected:
-            try:
-                # Check for new responses
-                if hasattr(self.client, 'Responses') and len(self.client.Responses) > 0:
-                    self.status_listbox.Items.Clear()
-                    
-                    # Process all available responses
-                    responses_to_process = list(self.client.Responses)  # Create a copy
-                    del self.client.Responses[:]  # Clear the original list (Python 2.7 compatible)
-                    
-                    for response in responses_to_process:
-                        if isinstance(response, dict):
-                            for key, value in response.items():
-                                status_item = "{0}: {1}".format(key, value)
-                                self.status_listbox.Items.Add(status_item)
-                        else:
-                            # Handle non-dict responses
-                            self.status_listbox.Items.Add(str(response))
-                    
-                    # Keep only recent status items
-                    while self.status_listbox.Items.Count > 20:
-                        self.status_listbox.Items.RemoveAt(0)
-                        
-            except Exception as ex:
-                # Check if this is a socket exception
-                if "SocketException" in str(ex) or "established connection was aborted" in str(ex):
-                    # Connection has been lost, update UI accordingly
-                    self.log_message("Connection lost to instrument")
-                    self.connected = False
-                    self.connection_status.Text = "Connection Lost"
-                    self.connection_status.ForeColor = Color.Orange
-                    self.connect_button.Enabled = True
-                    self.disconnect_button.Enabled = False
-                    self.enable_controls(False)
-                    if self.status_timer:
-                        self.status_timer.Stop()
-                else:
-                    self.log_message("Status update error: {0}".format(str(ex)))
-
-    # New event handlers for worksheet management
-    def worksheet_new_clicked(self, sender, e):
-        """Create new worksheet from template"""
-        if not self.connected:
+    def update_status(self, state):
+        """Status timer callback - polls on a thread-pool thread"""
+        if not (self.client and self.connected):
             return
+        # Ticks arriving while a poll is still running are dropped, not queued
+        if not self._poll_lock.acquire(False):
+            return
+        try:
+            got_responses = self._poll_status_bg()
+            if self._polling:
+                self._schedule_next_poll(got_responses)
+        finally:
+            self._poll_lock.release()
+    
+    def _on_response_received(self, sender, e):
+        """Client ResponseReceived handler - collect the new responses right away"""
+        self.update_status(None)
+    
+    def _poll_status_bg(self):
+        """Collect new instrument responses off the UI thread, returning True if any arrived"""
+        status_items = None
+        error = None
         try:
-            if hasattr(self.client, 'WorksheetNew'):
-                self.client.WorksheetNew()
-                self.log_message("New worksheet created from template")
+            # Check for new responses
+            responses = getattr(self.client, 'Responses', None)
+            if responses:
+                # Take all available responses by swapping in an empty list
+                try:
+                    self.client.Responses = []
+                    responses_to_process = responses
+                except (AttributeError, TypeError):
+                    responses_to_process = list(responses)  # Create a copy
+                    del responses[:]  # Clear the original list (Python 2.7 compatible)
                 
-                # Try to detect samples in the new worksheet
-                self.detect_worksheet_samples()
+                status_items = []
+                for response in responses_to_process:
+                    if isinstance(response, dict):
+                        for key, value in response.items():
+                            status_items.append("{0}: {1}".format(key, value))
+                    else:
+                        # Handle non-dict responses
+                        status_items.append(str(response))
                 
+                # Keep only recent status items
+                status_items = status_items[-20:]
+        except Exception as ex:
+            error = ex
+        
+        if error is None:
+            if status_items is None:
+                return False  # Nothing new to show
+            # Skip the UI update entirely when the rows are unchanged
+            fingerprint = zlib.crc32(repr(status_items))
+            if fingerprint == self._last_status_hash:
+                return True
+            self._last_status_hash = fingerprint
+        
+        self._post_to_ui(lambda: self._apply_status(status_items, error))
+        return status_items is not None
+    
+    def _apply_status(self, status_items, error):
+        """Apply polled status to the UI (runs on the UI thread)"""
+        if error is not None:
+            # Check if this is a socket exception
+            if _is_socket_error(error):
+                # Connection has been lost, update UI accordingly
+                self.log_message("Connection lost to instrument")
+                self.connected = False
+                self._clear_caps()
+                self.connection_status.Text = "Connection Lost"
+                self.connection_status.ForeColor = Color.Orange
+                self.connect_button.Enabled = True
+                self.disconnect_button.Enabled = False
+                self.enable_controls(False)
+                self.stop_status_polling()
             else:
-                self.log_message("WorksheetNew method not available")
+                self._logf("Status update error: {0}", str(error))
+            return
+        
+        if status_items is None:
+            return
+        
+        # Only rewrite rows whose text changed, with painting suspended
+        items = self.status_listbox.Items
+        last_rows = self._last_status_rows
+        self.status_listbox.BeginUpdate()
+        try:
+            shown = items.Count
+            if len(status_items) < shown:
+                # Fewer rows than shown - refill in one batch rather than trimming row by row
+                items.Clear()
+                items.AddRange(Array[object](status_items))
+            else:
+                for i in range(shown):
+                    if status_items[i] != last_rows[i]:
+                        items[i] = status_items[i]
+                if len(status_items) > shown:
+                    items.AddRange(Array[object](status_items[shown:]))
+        finally:
+            self.status_listbox.EndUpdate()
+        self._last_status_rows = status_items
+
+    # New event handlers for worksheet management
+    def _invoke(self, name, ok_msg, error_fmt, *args):
+        """Call client.<name>(*args) if it exists and log the outcome - returns True on success"""
+        fn = self._caps.get(name) if self._caps else getattr(self.client, name, None)
+        if not fn:
+            self._logf("{0} method not available", name)
+            return False
+        try:
+            fn(*args)
         except Exception as ex:
-            self.log_message("Error creating new worksheet: {0}".format(str(ex)))
+            self._logf(error_fmt, str(ex))
+            return False
+        self.log_message(ok_msg)
+        return True
+    
+    def worksheet_new_clicked(self, sender, e):
+        """Create new worksheet from template"""
+        if not self.connected:
+            return
+        if self._invoke('WorksheetNew', "New worksheet created from template", "Error creating new worksheet: {0}"):
+            # Try to detect samples in the new worksheet
+            self._worksheet_changed()
+            self.detect_worksheet_samples()
     
     def worksheet_open_clicked(self, sender, e):
         """Open existing worksheet"""
         if not self.connected:
             return
         try:
-            from System.Windows.Forms import OpenFileDialog, DialogResult
             dialog = OpenFileDialog()
             dialog.Filter = "Worksheet Files (*.mpws)|*.mpws|All Files (*.*)|*.*"
             dialog.Title = "Open Worksheet"
             
             if dialog.ShowDialog() == DialogResult.OK:
-                if hasattr(self.client, 'WorksheetOpen'):
-                    self.client.WorksheetOpen(dialog.FileName)
-                    self.log_message("Worksheet opened: {0}".format(dialog.FileName))
-                    
+                if self._invoke('WorksheetOpen', "Worksheet opened: {0}".format(dialog.FileName),
+                                "Error opening worksheet: {0}", dialog.FileName):
                     # Try to detect samples in the opened worksheet
+                    self._worksheet_changed()
                     self.detect_worksheet_samples()
-                    
-                else:
-                    self.log_message("WorksheetOpen method not available")
         except Exception as ex:
-            self.log_message("Error opening worksheet: {0}".format(str(ex)))
+            self._logf("Error opening worksheet: {0}", str(ex))
     
     def worksheet_save_clicked(self, sender, e):
         """Save current worksheet"""
         if not self.connected:
             return
         try:
-            if hasattr(self.client, 'WorksheetSaveAs'):
-                from System.Windows.Forms import SaveFileDialog, DialogResult
+            if self._caps and self._caps.get('WorksheetSaveAs'):
                 dialog = SaveFileDialog()
                 dialog.Filter = "Worksheet Files (*.mpws)|*.mpws|All Files (*.*)|*.*"
                 dialog.Title = "Save Worksheet"
                 
                 if dialog.ShowDialog() == DialogResult.OK:
-                    self.client.WorksheetSaveAs(dialog.FileName)
-                    self.log_message("Worksheet saved: {0}".format(dialog.FileName))
+                    path = dialog.FileName
+                    self._post_command("WorksheetSaveAs", lambda: self.client.WorksheetSaveAs(path),
+                                       "Worksheet saved: {0}".format(path), "Error saving worksheet: {0}")
             else:
                 self.log_message("WorksheetSaveAs method not available")
         except Exception as ex:
-            self.log_message("Error saving worksheet: {0}".format(str(ex)))
+            self._logf("Error saving worksheet: {0}", str(ex))
     
     def worksheet_save_close_clicked(self, sender, e):
         """Save and close current worksheet"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'WorksheetSaveClose'):
-                self.client.WorksheetSaveClose()
-                self.log_message("Worksheet saved and closed")
-            else:
-                self.log_message("WorksheetSaveClose method not available")
-        except Exception as ex:
-            self.log_message("Error saving and closing worksheet: {0}".format(str(ex)))
+        if self.connected:
+            if self._invoke('WorksheetSaveClose', "Worksheet saved and closed", "Error saving and closing worksheet: {0}"):
+                self._worksheet_changed()
     
     def worksheet_delete_results_clicked(self, sender, e):
         """Delete results from current worksheet"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'DeleteResults'):
-                self.client.DeleteResults()
-                self.log_message("Results deleted from worksheet")
-            else:
-                self.log_message("DeleteResults method not available")
-        except Exception as ex:
-            self.log_message("Error deleting results: {0}".format(str(ex)))
+        if self.connected:
+            self._invoke('DeleteResults', "Results deleted from worksheet", "Error deleting results: {0}")
     
     def worksheet_close_clicked(self, sender, e):
         """Close current worksheet"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'WorksheetClose'):
-                self.client.WorksheetClose()
-                self.log_message("Worksheet closed")
-            else:
-                self.log_message("WorksheetClose method not available")
-        except Exception as ex:
-            self.log_message("Error closing worksheet: {0}".format(str(ex)))
+        if self.connected:
+            if self._invoke('WorksheetClose', "Worksheet closed", "Error closing worksheet: {0}"):
+                self._worksheet_changed()
     
     def lims_export_clicked(self, sender, e):
         """Export data to LIMS format"""
         if not self.connected:
             return
         try:
-            if self.lims_output_path and hasattr(self.client, 'Export'):
-                self.client.Export(self.lims_output_path)
-                self.log_message("Data exported to LIMS format: {0}".format(self.lims_output_path))
-                MessageBox.Show("Data exported successfully!\n\nFile saved to:\n{0}".format(self.lims_output_path), 
-                              "LIMS Export Complete", MessageBoxButtons.OK, MessageBoxIcon.Information)
+            if self.lims_output_path and self._caps.get('Export'):
+                path = self.lims_output_path
+                
+                def lims_export():
+                    # The LIMS path is a folder, so the SDK picks the file name - no stream export
+                    self.client.Export(path)
+                    self._logf("Data exported to LIMS format: {0}", path)
+                    self._show_info_async("Data exported successfully!\n\nFile saved to:\n{0}".format(path),
+                                          "LIMS Export Complete")
+                
+                self._post_command("Export", lims_export, None, "Error exporting to LIMS: {0}")
             else:
                 self.log_message("LIMS output path not set or Export method not available")
                 MessageBox.Show("Please set LIMS output path first", "Export Error",
                               MessageBoxButtons.OK, MessageBoxIcon.Warning)
         except Exception as ex:
-            self.log_message("Error exporting to LIMS: {0}".format(str(ex)))
+            self._logf("Error exporting to LIMS: {0}", str(ex))
     
     def lims_browse_clicked(self, sender, e):
         """Browse for LIMS output path"""
         try:
-            from System.Windows.Forms import FolderBrowserDialog, DialogResult
             dialog = FolderBrowserDialog()
             dialog.Description = "Select LIMS Export Folder"
             
             if dialog.ShowDialog() == DialogResult.OK:
                 self.lims_output_path = dialog.SelectedPath
-                self.log_message("LIMS output path set to: {0}".format(self.lims_output_path))
+                self._logf("LIMS output path set to: {0}", self.lims_output_path)
         except Exception as ex:
-            self.log_message("Error setting LIMS path: {0}".format(str(ex)))
+            self._logf("Error setting LIMS path: {0}", str(ex))
     
     # Fixed button name reference
     def lims_location_clicked(self, sender, e):
@@ -1212,27 +1635,29 @@ class InstrumentControlGUI(Form):
     
     def select_for_measurement_clicked(self, sender, e):
         """Select sample for measurement"""
-        if self.sample_listbox.SelectedIndex >= 0:
-            selected_sample = self.sample_listbox.SelectedItem
-            self.log_message("Selected sample for measurement: {0}".format(selected_sample))
+        selected = self.sample_listview.SelectedIndices
+        if selected.Count > 0:
+            selected_sample = self._samples[selected[0]]
+            self._logf("Selected sample for measurement: {0}", selected_sample)
             
             # If connected, try to select the solution
             if self.client and self.connected:
                 try:
-                    if hasattr(self.client, 'SelectSolution'):
-                        self.client.SelectSolution(str(selected_sample))
-                        self.log_message("Solution selected in instrument: {0}".format(selected_sample))
+                    select_solution = self._caps.get('SelectSolution')
+                    if select_solution:
+                        select_solution(str(selected_sample))
+                        self._logf("Solution selected in instrument: {0}", selected_sample)
                     else:
                         self.log_message("SelectSolution method not available")
                 except Exception as ex:
-                    self.log_message("Error selecting solution: {0}".format(str(ex)))
+                    self._logf("Error selecting solution: {0}", str(ex))
         else:
             self.log_message("No sample selected in list")
     
     def deselect_for_measurement_clicked(self, sender, e):
         """Deselect sample for measurement"""
-        if self.sample_listbox.SelectedIndex >= 0:
-            self.sample_listbox.ClearSelected()
+        if self.sample_listview.SelectedIndices.Count > 0:
+            self.sample_listview.SelectedIndices.Clear()
             self.log_message("Sample deselected")
         else:
             self.log_message("No sample was selected")
@@ -1241,174 +1666,220 @@ class InstrumentControlGUI(Form):
         """Delete results from current worksheet - fixed button name reference"""
         self.worksheet_delete_results_clicked(sender, e)
     
-    def detect_worksheet_samples(self):
-        """Detect and display samples from the currently opened worksheet"""
+    def _post_to_ui(self, fn):
+        """Queue fn() on the UI thread without waiting - dropped if the form is already closed"""
         try:
-            # Clear existing sample queue
-            self.sample_listbox.Items.Clear()
-            
-            # Try different methods to get sample information
-            samples_found = False
-            
-            # Method 1: Try GetSamples if available
-            if hasattr(self.client, 'GetSamples'):
-                try:
-                    samples = self.client.GetSamples()
-                    if samples:
-                        for sample in samples:
-                            self.sample_listbox.Items.Add(str(sample))
-                        samples_found = True
-                        self.log_message("Found {0} samples in worksheet using GetSamples".format(len(samples)))
-                except Exception as ex:
-                    self.log_message("GetSamples error: {0}".format(str(ex)))
-            
-            # Method 2: Try GetSampleList if available
-            if not samples_found and hasattr(self.client, 'GetSampleList'):
-                try:
-                    sample_list = self.client.GetSampleList()
-                    if sample_list:
-                        if hasattr(sample_list, '__iter__'):
-                            for sample in sample_list:
-                                self.sample_listbox.Items.Add(str(sample))
-                        else:
-                            # If it's a single item or string
-                            self.sample_listbox.Items.Add(str(sample_list))
-                        samples_found = True
-                        sample_count = len(sample_list) if hasattr(sample_list, '__len__') else 1
-                        self.log_message("Found {0} samples in worksheet using GetSampleList".format(sample_count))
-                except Exception as ex:
-                    self.log_message("GetSampleList error: {0}".format(str(ex)))
-            
-            # Method 3: Try GetWorksheetInfo or similar methods
-            if not samples_found and hasattr(self.client, 'GetWorksheetInfo'):
-                try:
-                    worksheet_info = self.client.GetWorksheetInfo()
-                    if worksheet_info and hasattr(worksheet_info, 'Samples'):
-                        for sample in worksheet_info.Samples:
-                            self.sample_listbox.Items.Add(str(sample))
-                        samples_found = True
-                        self.log_message("Found {0} samples in worksheet using GetWorksheetInfo".format(len(worksheet_info.Samples)))
-                except Exception as ex:
-                    self.log_message("GetWorksheetInfo error: {0}".format(str(ex)))
-            
-            # Method 4: Try GetSampleNames if available
-            if not samples_found and hasattr(self.client, 'GetSampleNames'):
-                try:
-                    sample_names = self.client.GetSampleNames()
-                    if sample_names:
-                        for name in sample_names:
-                            self.sample_listbox.Items.Add(str(name))
-                        samples_found = True
-                        self.log_message("Found {0} samples in worksheet using GetSampleNames".format(len(sample_names)))
-                except Exception as ex:
-                    self.log_message("GetSampleNames error: {0}".format(str(ex)))
-            
-            # Method 5: Try to get sample count and generate generic names
-            if not samples_found and hasattr(self.client, 'GetSampleCount'):
-                try:
-                    count = self.client.GetSampleCount()
-                    if count and count > 0:
-                        for i in range(int(count)):
-                            sample_name = "Sample_{0:03d}".format(i + 1)
-                            self.sample_listbox.Items.Add(sample_name)
-                        samples_found = True
-                        self.log_message("Found {0} samples in worksheet using GetSampleCount".format(count))
-                except Exception as ex:
-                    self.log_message("GetSampleCount error: {0}".format(str(ex)))
-            
+            self.BeginInvoke(Action(fn))
+        except Exception:
+            pass  # Form was closed while the background work was running
+    
+    def _worksheet_changed(self):
+        """Invalidate the detected sample list after the open worksheet changed"""
+        self._worksheet_id += 1
+    
+    def _fresh_samples(self):
+        """Return the memoized sample names if still fresh for the open worksheet, else None"""
+        detected_at, worksheet_id, names = self._samples_cache
+        if worksheet_id == self._worksheet_id and time.clock() - detected_at < self._samples_ttl:
+            return names
+        return None
+    
+    def _remember_samples(self, worksheet_id, names):
+        """Memoize detected sample names and show them (runs on the UI thread)"""
+        if worksheet_id != self._worksheet_id:
+            # Another worksheet was opened while this detection ran - its own detection will report
+            return
+        self._samples_cache = (time.clock(), worksheet_id, names)
+        self._populate_samples(names)
+    
+    def detect_worksheet_samples(self):
+        """Detect samples from the currently opened worksheet without blocking the UI"""
+        worksheet_id = self._worksheet_id
+        
+        def detect():
+            try:
+                names = self._detect_samples_bg()
+            except Exception as ex:
+                error = ex
+                self._post_to_ui(lambda: self._detect_samples_failed(worksheet_id, error))
+                return
+            self._post_to_ui(lambda: self._remember_samples(worksheet_id, names))
+        
+        # Queued like the other SDK calls - the client is not known to be safe for concurrent calls
+        self._post_command("Detect samples", detect, None, "Error detecting worksheet samples: {0}")
+    
+    def refresh_samples_clicked(self, sender, e):
+        """Handle refresh samples button click - always re-query the worksheet"""
+        if self.connected:
+            self.detect_worksheet_samples()
+    
+    def _detect_samples_failed(self, worksheet_id, error):
+        """Fall back to a placeholder sample when detection raised (runs on the UI thread)"""
+        if worksheet_id != self._worksheet_id:
+            return
+        self._logf("Error detecting worksheet samples: {0}", str(error))
+        # Add a default sample as fallback
+        self._populate_samples(["Sample_001"])
+        self.log_message("Added default sample due to detection error")
+    
+    def _detect_samples_bg(self):
+        """Return the sample names of the open worksheet - runs on the command worker"""
+        # Client methods were probed when the connection was made
+        caps = self._caps or {}
+        # Messages are collected here and logged in one batch when detection is done
+        log = []
+        debug = self._log_level <= LOG_LEVEL_DEBUG
+        
+        # Try the sample detection methods in order of preference until one returns names
+        for cap, adapt in SAMPLE_STRATEGIES:
+            fn = caps.get(cap)
+            if not fn:
+                continue
+            try:
+                names = adapt(fn())
+            except Exception as ex:
+                # Earlier strategies failing is expected - only formatted when debugging
+                if debug:
+                    log.append("{0} error: {1}".format(cap, str(ex)))
+                continue
+            if names:
+                found = names
+                log.append("Found {0} samples in worksheet using {1}".format(len(found), cap))
+                break
+        else:
             # If no samples found, log available methods for debugging
-            if not samples_found:
-                available_methods = [method for method in dir(self.client) 
-                                   if not method.startswith('_') and 
-                                   ('sample' in method.lower() or 'worksheet' in method.lower())]
-                if available_methods:
-                    self.log_message("No sample detection method worked. Available sample/worksheet methods: {0}".format(', '.join(available_methods[:10])))
-                else:
-                    self.log_message("No sample detection methods available in SDK")
-                
-                # Add a default sample as placeholder
-                self.sample_listbox.Items.Add("Sample_001")
-                self.log_message("Added default sample placeholder - worksheet samples not auto-detected")
+            available_methods = self._sample_methods()
+            if available_methods:
+                log.append("No sample detection method worked. Available sample/worksheet methods: {0}".format(', '.join(available_methods)))
+            else:
+                log.append("No sample detection methods available in SDK")
             
-        except Exception as ex:
-            self.log_message("Error detecting worksheet samples: {0}".format(str(ex)))
-            # Add a default sample as fallback
-            self.sample_listbox.Items.Add("Sample_001")
-            self.log_message("Added default sample due to detection error")
+            # Add a default sample as placeholder
+            found = ["Sample_001"]
+            log.append("Added default sample placeholder - worksheet samples not auto-detected")
+        
+        self.log_lines(log)
+        return found
     
-    def select_solution_clicked(self, sender, e):
-        """Select solution for measurement"""
+    def refresh_all_clicked(self, sender, e):
+        """Query version, status and worksheet samples and show them in one UI pass"""
         if not self.connected:
             return
-        try:
-            if hasattr(self.client, 'SelectSolution'):
-                # You could add a dialog here to select which solution
-                self.client.SelectSolution()
-                self.log_message("Solution selected for measurement")
-            else:
-                self.log_message("SelectSolution method not available")
-        except Exception as ex:
-            self.log_message("Error selecting solution: {0}".format(str(ex)))
+        self.log_message("Refreshing version, status and samples...")
+        worksheet_id = self._worksheet_id
+        
+        def refresh():
+            results = self._refresh_all_bg()
+            self._post_to_ui(lambda: self._finish_refresh_all(worksheet_id, results))
+        
+        # The client is not known to be safe for concurrent calls - queue behind other commands
+        self._post_command("Refresh all", refresh, None, "Refresh error: {0}")
     
-    def get_version_clicked(self, sender, e):
-        """Get software version information"""
-        if not self.connected:
+    def _refresh_all_bg(self):
+        """Run the refresh queries one after another on the command worker - returns {key: (result, error)}"""
+        caps = self._caps or {}
+        results = {}
+        jobs = []
+        get_version = caps.get('GetVersion')
+        if get_version:
+            jobs.append(("version", get_version))
+        get_status = caps.get('GetStatus')
+        if get_status:
+            jobs.append(("status", get_status))
+        names = self._fresh_samples()
+        if names is not None:
+            # Reused names keep their original detection time so the TTL still runs out
+            results["cached_samples"] = names
+        else:
+            jobs.append(("samples", self._detect_samples_bg))
+        
+        for key, fn in jobs:
+            try:
+                results[key] = (fn(), None)
+            except Exception as ex:
+                results[key] = (None, ex)
+        return results
+    
+    def _finish_refresh_all(self, worksheet_id, results):
+        """Apply the refresh results in one UI pass"""
+        for key, ok_fmt, error_fmt in (("version", LOG_VERSION, LOG_ERR_VERSION),
+                                       ("status", LOG_STATUS, LOG_ERR_STATUS)):
+            if key not in results:
+                continue
+            value, error = results[key]
+            if error is not None:
+                self._logf(error_fmt, str(error))
+            else:
+                self._logf(ok_fmt, str(value))
+        
+        if "cached_samples" in results:
+            if worksheet_id != self._worksheet_id:
+                # Another worksheet was opened since the refresh was queued
+                return
+            self._populate_samples(results["cached_samples"])
+            self.log_message("Sample list is current - reused without querying the instrument")
             return
+        names, error = results["samples"]
+        if error is not None:
+            self._detect_samples_failed(worksheet_id, error)
+        else:
+            self._remember_samples(worksheet_id, names)
+    
+    def _invoke_simple(self, fn, ok_fmt, error_fmt):
+        """Call a probed no-argument client method and log its result as {0} in ok_fmt"""
         try:
-            if hasattr(self.client, 'GetVersion'):
-                version = self.client.GetVersion()
-                self.log_message("Software version: {0}".format(str(version)))
-            else:
-                self.log_message("GetVersion method not available")
+            result = fn()
         except Exception as ex:
-            self.log_message("Error getting version: {0}".format(str(ex)))
+            self._logf(error_fmt, str(ex))
+            return
+        self._logf(ok_fmt, str(result))
+    
+    @requires_cap('SelectSolution')
+    def select_solution_clicked(self, fn, sender, e):
+        """Select solution for measurement"""
+        # You could add a dialog here to select which solution
+        self._invoke_simple(fn, LOG_SELECT_SOLUTION, LOG_ERR_SELECT_SOLUTION)
+    
+    @requires_cap('GetVersion')
+    def get_version_clicked(self, fn, sender, e):
+        """Get software version information"""
+        self._invoke_simple(fn, LOG_VERSION, LOG_ERR_VERSION)
     
-    def get_status_clicked(self, sender, e):
+    @requires_cap('GetStatus')
+    def get_status_clicked(self, fn, sender, e):
         """Get detailed instrument status"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'GetStatus'):
-                status = self.client.GetStatus()
-                self.log_message("Instrument status: {0}".format(str(status)))
-            else:
-                self.log_message("GetStatus method not available")
-        except Exception as ex:
-            self.log_message("Error getting status: {0}".format(str(ex)))
+        self._invoke_simple(fn, LOG_STATUS, LOG_ERR_STATUS)
     
-    def ready_clicked(self, sender, e):
+    @requires_cap('Ready')
+    def ready_clicked(self, fn, sender, e):
         """Set instrument to ready state"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'Ready'):
-                self.client.Ready()
-                self.log_message("Instrument set to ready state")
-            else:
-                self.log_message("Ready method not available")
-        except Exception as ex:
-            self.log_message("Error setting ready state: {0}".format(str(ex)))
+        self._invoke_simple(fn, LOG_READY, LOG_ERR_READY)
     
-    def standby_clicked(self, sender, e):
+    @requires_cap('Standby')
+    def standby_clicked(self, fn, sender, e):
         """Set instrument to standby state"""
-        if not self.connected:
-            return
-        try:
-            if hasattr(self.client, 'Standby'):
-                self.client.Standby()
-                self.log_message("Instrument set to standby state")
-            else:
-                self.log_message("Standby method not available")
-        except Exception as ex:
-            self.log_message("Error setting standby state: {0}".format(str(ex)))
+        self._invoke_simple(fn, LOG_STANDBY, LOG_ERR_STANDBY)
 
-def main():
-    """Main entry point for GUI application"""
+# Set once the process-wide WinForms settings have been applied
+_WINFORMS_INITED = False
+
+def _init_winforms():
+    """Apply visual styles and text rendering once per process"""
+    global _WINFORMS_INITED
+    if _WINFORMS_INITED:
+        return
     Application.EnableVisualStyles()
+    # Only allowed before the first window is created - a relaunch in the same process would throw
     Application.SetCompatibleTextRenderingDefault(False)
+    _WINFORMS_INITED = True
+
+def main():
+    """Main entry point for GUI application"""
+    _init_winforms()
+    log_level = LOG_LEVEL_DEBUG if '--debug' in sys.argv[1:] else LOG_LEVEL_INFO
     
     # Create and run the GUI
-    app = InstrumentControlGUI()
+    app = InstrumentControlGUI(log_level=log_level)
     Application.Run(app)
 
 if __name__ == '__main__':